@@ -0,0 +1,310 @@
+"""Benchmarks for the price and level pipeline.
+
+Runs offline against synthetic Nordpool fixtures (see `fixtures.py`). The
+engine functions and the offline update cycle (`cycle[...]`: both sensors'
+update path rebuilt on `engine.py` with `zoneinfo` for the local day) need
+nothing but the standard library. The sensor update cycle through the real
+entities (`update_cycle[...]`) uses a minimal stand-in for `hass` (no Home
+Assistant instance is started) and is skipped when the `homeassistant`
+package is missing.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --json before.json
+    python benchmarks/bench_pipeline.py --baseline before.json
+
+Per benchmark the best and median time per call are reported, plus the peak
+traced memory and net allocated blocks of a single call (`tracemalloc`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.power_price_level import engine, vectorized  # noqa: E402
+from custom_components.power_price_level.labels import _read_all_translations, level_labels  # noqa: E402
+from fixtures import FIXTURES, nordpool_attributes  # noqa: E402
+
+NORDPOOL = "sensor.nordpool_bench"
+TIME_ZONE = "Europe/Oslo"
+
+ENTRY_DATA = {
+    "nordpool_entity": NORDPOOL,
+    "sensor_name": "Power Price",
+    "currency": "NOK",
+    "grid_day": 0.4,
+    "grid_night": 0.3,
+    "grid_night_start": 22,
+    "grid_night_end": 6,
+    "additional": 0.01,
+    "cheap_price": 0.6,
+    "night_hour_end": 6,
+    "day_hour_end": 15,
+    "cheap_hours": 5,
+    "expensive_hours": 5,
+    "cheap_hours_night": 2,
+    "cheap_hours_day": 2,
+    "cheap_hours_evening": 2,
+    "level_language": "en",
+}
+
+
+# ---------------------------
+# hass stand-in
+# ---------------------------
+
+class _States:
+    def __init__(self) -> None:
+        self._states: dict[str, SimpleNamespace] = {}
+
+    def get(self, entity_id: str) -> SimpleNamespace | None:
+        return self._states.get(entity_id)
+
+    def set(self, entity_id: str, state: Any, attributes: dict[str, Any]) -> None:
+        self._states[entity_id] = SimpleNamespace(entity_id=entity_id, state=state, attributes=attributes)
+
+
+class _Registry:
+    """Entity registry without entries (the level sensor then uses the in-memory handoff)."""
+
+    def async_get_entity_id(self, domain: str, platform: str, unique_id: str) -> str | None:
+        return None
+
+
+class FakeHass:
+    """Just enough of `HomeAssistant` for the sensors' `async_update`."""
+
+    def __init__(self) -> None:
+        from homeassistant.helpers import entity_registry as er
+
+        self.states = _States()
+        self.data: dict[str, Any] = {er.DATA_REGISTRY: _Registry()}
+
+    def async_add_executor_job(self, target: Callable, *args: Any) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        fut.set_result(target(*args))
+        return fut
+
+    def async_create_task(self, coro: Any) -> asyncio.Task:
+        return asyncio.ensure_future(coro)
+
+
+def _entry(entry_id: str, **options: Any) -> SimpleNamespace:
+    return SimpleNamespace(entry_id=entry_id, data=dict(ENTRY_DATA), options={**ENTRY_DATA, **options})
+
+
+# ---------------------------
+# Measurement
+# ---------------------------
+
+def _measure(call: Callable[[], Any], number: int, repeat: int) -> dict[str, float]:
+    """Time `number` calls `repeat` times; trace allocations of one extra call."""
+    call()  # warm caches (labels, source spot arrays)
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        runs.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    call()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    return {
+        "best_us": min(runs) * 1e6,
+        "median_us": statistics.median(runs) * 1e6,
+        "peak_kib": peak / 1024,
+        "blocks": blocks,
+    }
+
+
+def _function_benchmarks() -> dict[str, Callable[[], Any]]:
+    pcfg = engine.price_config(ENTRY_DATA)
+    lcfg = engine.level_config(ENTRY_DATA)
+    day_start = datetime(2024, 10, 27, tzinfo=ZoneInfo(TIME_ZONE))
+    out: dict[str, Callable[[], Any]] = {}
+    for name, make in FIXTURES.items():
+        quarter = make()
+        hourly = engine.quarterhour_to_hourly(quarter)
+        hours = engine.slot_hours(day_start, len(quarter), 15)
+        hourly_hours = engine.slot_hours(day_start, len(hourly), 60)
+        hour_prices = engine.price_table(hourly, pcfg, hourly_hours)
+        slot_prices = engine.price_table(quarter, pcfg, hours)
+
+        out[f"quarterhour_to_hourly[{name}]"] = lambda q=quarter: engine.quarterhour_to_hourly(q)
+        out[f"to_quarterhour[{name}]"] = lambda q=quarter: engine.to_quarterhour(q)
+        out[f"build_hour_prices[{name}]"] = lambda h=hourly, hs=hourly_hours: engine.price_table(h, pcfg, hs)
+        out[f"build_slot_prices[{name}]"] = lambda q=quarter, hs=hours: engine.price_table(q, pcfg, hs)
+        out[f"day_levels_hour[{name}]"] = lambda p=hour_prices, hs=hourly_hours: engine.day_levels(p, lcfg, hs, 1)
+        out[f"day_levels_quarter[{name}]"] = lambda p=slot_prices, hs=hours: engine.day_levels(p, lcfg, hs, 4)
+    return out
+
+
+def _block_benchmarks() -> dict[str, Callable[[], Any]]:
+    """A year of quarter-hour days at once: NumPy block backend vs the per-day engine."""
+    pcfg = engine.price_config(ENTRY_DATA)
+    lcfg = engine.level_config(ENTRY_DATA)
+    tz = ZoneInfo(TIME_ZONE)
+    makers = list(FIXTURES.values())
+    days = [makers[i % len(makers)]() for i in range(365)]
+    hours = [engine.slot_hours(datetime(2024, 1, 1, tzinfo=tz), len(d), 15) for d in days]
+    prices = [engine.price_table(d, pcfg, h) for d, h in zip(days, hours)]
+
+    out: dict[str, Callable[[], Any]] = {
+        "year_prices[python]": lambda: [engine.price_table(d, pcfg, h) for d, h in zip(days, hours)],
+        "year_levels[python]": lambda: [engine.day_levels(p, lcfg, h, 4) for p, h in zip(prices, hours)],
+    }
+    if vectorized.HAS_NUMPY:
+        out["year_prices[numpy]"] = lambda: vectorized.price_tables(days, pcfg, hours)
+        out["year_levels[numpy]"] = lambda: vectorized.level_tables(prices, lcfg, hours, 4)
+    return out
+
+
+# English level labels for the offline cycle's label tables
+_LABELS = level_labels(_read_all_translations(), "en")
+
+
+def _offline_cycle(nordpool: dict[str, Any], cfg: dict[str, Any], tz: ZoneInfo, now: datetime) -> dict[str, Any]:
+    """Both sensors' update for one entry without Home Assistant.
+
+    Follows `PowerPriceSensor.async_update` and `PowerPriceLevelSensor._compute_levels`:
+    normalize the spot arrays, lay out the real slots of today and tomorrow,
+    build the price and state tables, the raw slot lists (Standard format),
+    the window tables and the level keys with their label tables.
+    """
+    slot_minutes = 15 if cfg.get("resolution") == "quarter_hour" else 60
+    sph = 60 // slot_minutes
+    standard = cfg.get("attribute_format", "standard") == "standard"
+    normalize = engine.quarterhour_to_hourly if slot_minutes == 60 else engine.to_quarterhour
+    pcfg = engine.price_config(cfg)
+    lcfg = engine.level_config(cfg)
+    start_today = datetime.combine(now.date(), dt_time(), tzinfo=tz)
+    step = timedelta(minutes=slot_minutes)
+
+    days = []
+    for offset, spot in enumerate((normalize(nordpool["today"]), normalize(nordpool.get("tomorrow") or []))):
+        starts = engine.slot_starts(start_today + timedelta(days=offset), len(spot), slot_minutes)
+        hours = [t.hour for t in starts]
+        prices = engine.price_table(spot, pcfg, hours)
+        day = {"prices": prices, "state": engine.state_table(spot, pcfg, hours), "hours": hours}
+        if standard:
+            day["raw"] = [
+                {"start": t.isoformat(), "end": (t.astimezone(timezone.utc) + step).astimezone(tz).isoformat(), "value": float(v or 0.0)}
+                for t, v in zip(starts, prices)
+            ]
+        days.append(day)
+
+    joined = days[0]["prices"] + days[1]["prices"]
+    windows = {hours: engine.window_table(joined, hours * sph) for hours in (3,)}
+    out: dict[str, Any] = {"days": days, "windows": windows}
+    for day in days:
+        day["levels"] = engine.day_levels(day["prices"], lcfg, day["hours"], sph) if day["prices"] else []
+        if standard:
+            day["labels"] = [_LABELS.get(k) for k in day["levels"]]
+    return out
+
+
+def _cycle_benchmarks() -> dict[str, Callable[[], Any]]:
+    """Offline update cycle of one entry per resolution and attribute format (no Home Assistant)."""
+    tz = ZoneInfo(TIME_ZONE)
+    now = datetime(2024, 10, 1, 12, tzinfo=tz)
+    nordpool = nordpool_attributes("normal_96")
+    out: dict[str, Callable[[], Any]] = {}
+    for resolution in ("hour", "quarter_hour"):
+        for attribute_format in ("standard", "compact"):
+            cfg = {**ENTRY_DATA, "resolution": resolution, "attribute_format": attribute_format}
+            out[f"cycle[{resolution},{attribute_format}]"] = lambda c=cfg: _offline_cycle(nordpool, c, tz, now)
+    return out
+
+
+def _update_benchmarks(loop: asyncio.AbstractEventLoop) -> dict[str, Callable[[], Any]]:
+    """Full `async_update` of both sensors of one entry (forced recompute)."""
+    try:
+        from homeassistant.util import dt as dt_util
+
+        from custom_components.power_price_level import sensor
+    except ImportError:
+        print("homeassistant not installed; skipping update_cycle benchmarks", file=sys.stderr)
+        return {}
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone(TIME_ZONE))
+    out: dict[str, Callable[[], Any]] = {}
+    for resolution in ("hour", "quarter_hour"):
+        for attribute_format in ("standard", "compact"):
+            hass = FakeHass()
+            hass.states.set(NORDPOOL, 1.0, nordpool_attributes("normal_96"))
+            entry = _entry(f"{resolution}_{attribute_format}", resolution=resolution, attribute_format=attribute_format)
+            price = sensor.PowerPriceSensor(hass, entry)
+            level = sensor.PowerPriceLevelSensor(hass, entry)
+
+            async def _cycle(price=price, level=level) -> None:
+                await price.async_update()
+                await level.async_update()
+
+            out[f"update_cycle[{resolution},{attribute_format}]"] = lambda c=_cycle: loop.run_until_complete(c())
+    return out
+
+
+def _print(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]] | None) -> None:
+    header = f"{'benchmark':<44} {'best us':>10} {'median us':>10} {'peak KiB':>9} {'blocks':>7}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = f"{name:<44} {r['best_us']:>10.1f} {r['median_us']:>10.1f} {r['peak_kib']:>9.1f} {r['blocks']:>7d}"
+        if baseline and name in baseline:
+            line += f" {r['best_us'] / baseline[name]['best_us']:>7.2f}x"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=200, help="calls per timing run")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timing runs per benchmark")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare best times against a --json file")
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    try:
+        benchmarks = {**_function_benchmarks(), **_block_benchmarks(), **_cycle_benchmarks(), **_update_benchmarks(loop)}
+        results = {
+            name: _measure(call, args.number, args.repeat)
+            for name, call in benchmarks.items()
+            if args.filter in name
+        }
+    finally:
+        loop.close()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    _print(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Synthetic Nordpool fixtures for the benchmarks (deterministic, offline)."""
+
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+SEED = 20241027
+
+
+def _day(n: int, seed: int, low: float = 0.2, high: float = 2.5) -> list[Optional[float]]:
+    rng = random.Random(seed)
+    return [round(rng.uniform(low, high), 4) for _ in range(n)]
+
+
+def normal_day() -> list[Optional[float]]:
+    """Regular 96-slot quarter-hour day."""
+    return _day(96, SEED)
+
+
+def dst_short_day() -> list[Optional[float]]:
+    """Spring-forward day (23 h, 92 slots)."""
+    return _day(92, SEED + 1)
+
+
+def dst_long_day() -> list[Optional[float]]:
+    """Fall-back day (25 h, 100 slots)."""
+    return _day(100, SEED + 2)
+
+
+def gaps_day() -> list[Optional[float]]:
+    """96 slots with scattered and contiguous `None` gaps."""
+    vals = _day(96, SEED + 3)
+    rng = random.Random(SEED + 3)
+    for i in rng.sample(range(96), 10):
+        vals[i] = None
+    for i in range(40, 48):
+        vals[i] = None
+    return vals
+
+
+def negative_day() -> list[Optional[float]]:
+    """96 slots with a run of negative prices around midday."""
+    vals = _day(96, SEED + 4, low=-0.5, high=1.5)
+    for i in range(44, 60):
+        vals[i] = -abs(vals[i] or 0.1)
+    return vals
+
+
+def flat_day() -> list[Optional[float]]:
+    """96 slots drawn from three price levels (many ties)."""
+    rng = random.Random(SEED + 5)
+    return [rng.choice((0.5, 0.75, 1.0)) for _ in range(96)]
+
+
+FIXTURES = {
+    "normal_96": normal_day,
+    "dst_92": dst_short_day,
+    "dst_100": dst_long_day,
+    "gaps": gaps_day,
+    "negative": negative_day,
+    "flat_ties": flat_day,
+}
+
+
+def nordpool_attributes(name: str) -> dict:
+    """`today`/`tomorrow` attributes of a Nordpool entity for fixture `name`."""
+    today = FIXTURES[name]()
+    tomorrow = normal_day() if name != "normal_96" else dst_long_day()
+    return {"today": today, "tomorrow": tomorrow}
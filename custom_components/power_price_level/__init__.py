@@ -1,40 +1,39 @@
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 # logging and trace file removed
 
-from homeassistant import config_entries
-from .options_flow import PowerPriceLevelOptionsFlowHandler
+from .const import DOMAIN, PLATFORMS
 
+# Home Assistant and the sensor/flow modules are imported lazily so the
+# HA-free parts of the package (`engine`, `util`, `const`) import without
+# pulling in Home Assistant.
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
 
-async def async_get_options_flow(config_entry):
-    return PowerPriceLevelOptionsFlowHandler(config_entry)
 
+async def async_get_options_flow(config_entry):
+    from .options_flow import PowerPriceLevelOptionsFlowHandler
 
-from .const import DOMAIN, PLATFORMS
+    return PowerPriceLevelOptionsFlowHandler(config_entry)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Power Price Level from a config entry."""
+    from .coordinator import EntryRuntime
 
     hass.data.setdefault(DOMAIN, {})
-    # store a shallow copy of entry.data to avoid accidental mutation/race with entry updates
-    hass.data[DOMAIN][entry.entry_id] = dict(entry.data) if entry.data is not None else {}
+    # Per-entry runtime: config snapshot plus the price -> level handoff
+    hass.data[DOMAIN][entry.entry_id] = EntryRuntime(entry)
 
-    # Ensure options updates reload the config entry so changes take effect
+    # Apply option changes to the running sensors instead of reloading the
+    # entry (the reload path could freeze in some environments)
     async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-        try:
-            # Schedule reload as a background task instead of awaiting here.
-            # Awaiting inside an update listener can cause re-entrancy and freeze.
-            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
-        except Exception:
-            # logging removed
-            pass
-
-    # Re-enable automatic reload on entry update; listener schedules reload as a background task.
-    # Disable automatic reload-on-update to avoid freezes observed in some environments.
-    # If you want reload-on-update behavior, re-enable the next line.
-    # entry.add_update_listener(_async_update_listener)
+        hass.data[DOMAIN][entry.entry_id].async_apply_config(entry)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -42,8 +41,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    from .coordinator import EntryRuntime
+    from .discovery import async_unload_discovery
+    from .labels import DATA_TRANSLATIONS
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        # Re-read translation files on the next load (integration reload/update)
+        hass.data[DOMAIN].pop(DATA_TRANSLATIONS, None)
+        if not any(isinstance(value, EntryRuntime) for value in hass.data[DOMAIN].values()):
+            # Last entry gone: stop following the entity registry
+            async_unload_discovery(hass)
     return unload_ok
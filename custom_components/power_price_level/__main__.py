@@ -0,0 +1,7 @@
+"""Entry point for `python -m custom_components.power_price_level` (see `cli.py`)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,209 @@
+"""Binary sensors for sets of price levels ("cheap now", "most expensive hour", ...).
+
+Each entity is on while the level of the current slot is in its set of
+level keys. They follow the level table the entry's Power Price Level sensor
+publishes through the runtime (nothing is ranked or rendered again) and only
+write state when the on/off state or its next change moves.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BINARY_SENSOR_LEVELS,
+    CONF_CUSTOM_LEVELS,
+    CONF_SENSOR_NAME,
+    DEFAULT_CUSTOM_LEVELS,
+    DEFAULT_NAME,
+)
+from .coordinator import EntryRuntime, async_get_runtime
+from .engine import LEVEL_KEYS, PRICED_LEVEL_KEYS
+from .util import parse_level_sets
+
+# Entity name suffixes of the predefined sets
+_NAMES = {
+    "cheap": "Cheap",
+    "cheap_time": "Cheap time",
+    "cheapest_hours": "Cheapest hours",
+    "expensive": "Expensive",
+    "most_expensive": "Most expensive",
+}
+
+_ICON_ON = {
+    "cheap": "mdi:cash-check",
+    "cheap_time": "mdi:cash-check",
+    "cheapest_hours": "mdi:cash-check",
+    "expensive": "mdi:cash-remove",
+    "most_expensive": "mdi:cash-remove",
+}
+
+
+def _custom_level_sets(cfg: Any) -> list[tuple[str, ...]]:
+    """Configured custom level sets; an invalid value (not accepted by the flows) gives none."""
+    try:
+        return parse_level_sets(cfg.get(CONF_CUSTOM_LEVELS, DEFAULT_CUSTOM_LEVELS), PRICED_LEVEL_KEYS)
+    except ValueError:
+        return []
+
+
+def _custom_key(levels: tuple[str, ...]) -> str:
+    return "custom_" + "_".join(levels)
+
+
+# ---------------------------
+# Setup entry
+# ---------------------------
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
+    runtime = async_get_runtime(hass, entry)
+    # Custom entities by key, so option changes add and remove only the sets that changed
+    custom: dict[str, PowerPriceLevelBinarySensor] = {}
+
+    def _new_custom_entities() -> list[PowerPriceLevelBinarySensor]:
+        new = []
+        for levels in _custom_level_sets(entry.options or entry.data):
+            key = _custom_key(levels)
+            if key not in custom:
+                custom[key] = PowerPriceLevelBinarySensor(hass, entry, runtime, key, levels)
+                new.append(custom[key])
+        return new
+
+    async_add_entities(
+        [
+            PowerPriceLevelBinarySensor(hass, entry, runtime, key, levels, enabled_default=False)
+            for key, levels in BINARY_SENSOR_LEVELS.items()
+        ]
+        + _new_custom_entities()
+    )
+
+    @callback
+    def _async_config_changed(changed: set[str]) -> None:
+        if CONF_CUSTOM_LEVELS not in changed:
+            return
+        wanted = {_custom_key(levels) for levels in _custom_level_sets(entry.options or entry.data)}
+        registry = er.async_get(hass)
+        for key in [key for key in custom if key not in wanted]:
+            entity = custom.pop(key)
+            if entity.registry_entry is not None:
+                # Removing the registry entry removes the entity as well
+                registry.async_remove(entity.entity_id)
+            elif entity.hass is not None:
+                hass.async_create_task(entity.async_remove(force_remove=True))
+        new = _new_custom_entities()
+        if new:
+            async_add_entities(new)
+
+    entry.async_on_unload(runtime.async_add_config_listener(_async_config_changed))
+
+
+# ---------------------------
+# Level set binary sensor
+# ---------------------------
+
+class PowerPriceLevelBinarySensor(BinarySensorEntity):
+    """On while the current level key is in `levels`.
+
+    State is derived from the published level table, so it changes exactly
+    at the level sensor's slot selections; `next_change` is the start of the
+    next slot that flips it, over today's and tomorrow's tables.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        runtime: EntryRuntime,
+        key: str,
+        levels: tuple[str, ...],
+        enabled_default: bool = True,
+    ) -> None:
+        self.hass = hass
+        self._entry = entry
+        self._runtime = runtime
+        self._key = key
+        self._levels = frozenset(levels)
+        self._attr_unique_id = f"{entry.entry_id}_power_price_level_{key}"
+        self._attr_entity_registry_enabled_default = enabled_default
+        self._attr_name = self._name(entry.options or entry.data)
+
+        self._attr_is_on: Optional[bool] = None
+        self._attr_available = False
+        self._attr_extra_state_attributes = {"levels": list(levels), "next_change": None}
+        self._last_written: Optional[tuple] = None
+
+    def _name(self, cfg: Any) -> str:
+        base = str(cfg.get(CONF_SENSOR_NAME, self._entry.data.get(CONF_SENSOR_NAME, DEFAULT_NAME)))
+        suffix = _NAMES.get(self._key) or " + ".join(key for key in LEVEL_KEYS if key in self._levels)
+        return f"{base} {suffix}"
+
+    @property
+    def icon(self) -> Optional[str]:
+        if self.is_on:
+            return _ICON_ON.get(self._key, "mdi:cash-check")
+        return "mdi:cash"
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._runtime.async_add_level_listener(self._async_levels_published))
+        self.async_on_remove(self._runtime.async_add_config_listener(self._async_config_changed))
+        # Pick up a result the level sensor published before we were added;
+        # Home Assistant writes this first state once we return
+        self._async_update_from_levels()
+        self._last_written = (self._attr_available, self._attr_is_on, self._attr_name, self._attr_extra_state_attributes)
+
+    @callback
+    def _async_levels_published(self) -> None:
+        self._async_update_from_levels()
+        self._async_write_if_changed()
+
+    @callback
+    def _async_config_changed(self, changed: set[str]) -> None:
+        if CONF_SENSOR_NAME in changed:
+            self._attr_name = self._name(self._entry.options or self._entry.data)
+            self._async_write_if_changed()
+
+    @callback
+    def _async_update_from_levels(self) -> None:
+        """Derive on/off and the next change from the runtime's level result."""
+        result = self._runtime.levels
+        keys = (result.today + result.tomorrow) if result else []
+        index = result.index if result else 0
+        current = keys[index] if index < len(keys) else "unavailable"
+        if current == "unavailable":
+            self._attr_available = False
+            self._attr_is_on = None
+            next_change = None
+        else:
+            self._attr_available = True
+            self._attr_is_on = current in self._levels
+            change = index + 1
+            while change < len(keys) and keys[change] != "unavailable" and (keys[change] in self._levels) == self._attr_is_on:
+                change += 1
+            # Past the last known slot the next change is unknown
+            next_change = self._slot_start(result.day, result.slot_minutes, change) if change < len(keys) else None
+        if next_change != self._attr_extra_state_attributes.get("next_change"):
+            self._attr_extra_state_attributes = {**self._attr_extra_state_attributes, "next_change": next_change}
+
+    @staticmethod
+    def _slot_start(day, slot_minutes: int, index: int) -> str:
+        """Local ISO start of slot `index` counted from local midnight of `day` (real elapsed time)."""
+        start: datetime = dt_util.as_utc(dt_util.start_of_local_day(day))
+        return dt_util.as_local(start + timedelta(minutes=slot_minutes) * index).isoformat()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state unless availability, state, name and attributes equal the last write."""
+        current = (self._attr_available, self._attr_is_on, self._attr_name, self._attr_extra_state_attributes)
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
@@ -0,0 +1,245 @@
+"""Offline batch processing of stored Nordpool data.
+
+Reads day records (Nordpool attribute dumps) from JSON/JSONL files or
+stdin, applies an entry config (same keys as `const.py`) and writes the
+`prices` table and level keys the sensors would publish for each day, as
+JSONL or CSV. Runs on `engine.py` only; Home Assistant is not needed.
+
+    python -m custom_components.power_price_level --config entry.json \\
+        --time-zone Europe/Oslo archive/*.jsonl > out.jsonl
+
+A record is a JSON object with the day's spot prices in `today` and the
+day in `date` (YYYY-MM-DD); without `date` the day is taken from the first
+`raw_today` start. Records are processed as a stream, in input order; a
+malformed record is reported on stderr and the batch goes on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Optional, TextIO
+from zoneinfo import ZoneInfo
+
+from .const import CONF_RESOLUTION, DEFAULT_RESOLUTION, RESOLUTION_SLOT_MINUTES
+from .engine import (
+    LevelConfig,
+    PriceConfig,
+    day_levels,
+    level_config,
+    price_config,
+    price_table,
+    quarterhour_to_hourly,
+    slot_hours,
+    slot_starts,
+    to_quarterhour,
+)
+from .labels import _read_all_translations, level_labels
+
+CSV_FIELDS = ["date", "start", "end", "price", "level"]
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    pcfg: PriceConfig
+    lcfg: LevelConfig
+    slot_minutes: int
+    time_zone: str
+    labels: Optional[dict[str, str]] = None
+
+
+# ---------------------------
+# Input
+# ---------------------------
+
+def _read_records(stream: TextIO, name: str) -> Iterator[tuple[str, Any]]:
+    """Yield (location, record) from a JSON document (object or list) or JSONL stream.
+
+    JSONL lines are yielded unparsed and decoded per record (see
+    `_process_in_worker`), so one bad line only fails that record. A JSON
+    document that does not parse is yielded as its error.
+    """
+    first = ""
+    for line in stream:
+        if line.strip():
+            first = line
+            break
+    if not first:
+        return
+
+    if first.lstrip().startswith("[") or name.endswith(".json"):
+        try:
+            doc = json.loads(first + stream.read())
+        except ValueError as err:
+            yield name, err
+            return
+        for i, record in enumerate(doc if isinstance(doc, list) else [doc]):
+            yield f"{name}[{i}]", record
+        return
+
+    yield f"{name}:1", first
+    for lineno, line in enumerate(stream, start=2):
+        if line.strip():
+            yield f"{name}:{lineno}", line
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[tuple[str, Any]]:
+    """Yield (location, record) from each path in turn; `-` reads stdin."""
+    for path in paths:
+        if path == "-":
+            yield from _read_records(sys.stdin, "<stdin>")
+            continue
+        with open(path, encoding="utf-8") as fh:
+            yield from _read_records(fh, path)
+
+
+def _record_date(record: dict[str, Any]) -> date:
+    if record.get("date"):
+        return date.fromisoformat(str(record["date"])[:10])
+    raw = record.get("raw_today") or []
+    if raw and isinstance(raw[0], dict) and raw[0].get("start"):
+        return datetime.fromisoformat(str(raw[0]["start"])).date()
+    raise ValueError("record has neither `date` nor `raw_today` start")
+
+
+# ---------------------------
+# Processing
+# ---------------------------
+
+def process_record(record: dict[str, Any], bcfg: BatchConfig) -> dict[str, Any]:
+    """Compute one day exactly as `PowerPriceSensor`/`PowerPriceLevelSensor` do for `today`."""
+    day = _record_date(record)
+    tz = ZoneInfo(bcfg.time_zone)
+    day_start = datetime.combine(day, time(), tzinfo=tz)
+    raw = record.get("today") or []
+
+    spot = quarterhour_to_hourly(raw) if bcfg.slot_minutes == 60 else to_quarterhour(raw)
+    hours = slot_hours(day_start, len(spot), bcfg.slot_minutes)
+    prices = price_table(spot, bcfg.pcfg, hours)
+    levels = day_levels(prices, bcfg.lcfg, hours, 60 // bcfg.slot_minutes)
+
+    out: dict[str, Any] = {
+        "date": day.isoformat(),
+        "start": day_start.isoformat(),
+        "slot_minutes": bcfg.slot_minutes,
+        "prices": prices,
+        "levels": levels,
+    }
+    if bcfg.labels is not None:
+        out["labels"] = [bcfg.labels.get(k) for k in levels]
+    return out
+
+
+_WORKER_CFG: Optional[BatchConfig] = None
+
+
+def _init_worker(bcfg: BatchConfig) -> None:
+    global _WORKER_CFG
+    _WORKER_CFG = bcfg
+
+
+def _process_in_worker(item: tuple[str, Any]) -> tuple[str, Any]:
+    """Decode (JSONL lines), check and process one record; errors are returned, not raised."""
+    loc, record = item
+    if isinstance(record, Exception):
+        return loc, record
+    try:
+        if isinstance(record, str):
+            record = json.loads(record)
+        if not isinstance(record, dict):
+            raise ValueError(f"record is a JSON {type(record).__name__}, expected an object")
+        return loc, process_record(record, _WORKER_CFG)
+    except (ValueError, TypeError) as err:
+        return loc, err
+
+
+def process(records: Iterable[tuple[str, Any]], bcfg: BatchConfig, jobs: int = 1) -> Iterator[tuple[str, Any]]:
+    """Yield (location, result or exception) per record, in input order."""
+    if jobs <= 1:
+        _init_worker(bcfg)
+        yield from map(_process_in_worker, records)
+        return
+
+    import multiprocessing
+
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(bcfg,)) as pool:
+        yield from pool.imap(_process_in_worker, records, chunksize=64)
+
+
+# ---------------------------
+# Output
+# ---------------------------
+
+def _write_jsonl(out: TextIO, result: dict[str, Any]) -> None:
+    out.write(json.dumps(result, ensure_ascii=False))
+    out.write("\n")
+
+
+def _write_csv(writer: Any, result: dict[str, Any], time_zone: str) -> None:
+    # One start past the last slot: each end is the next start, stepped in
+    # UTC, so DST-day rows neither overlap nor hold nonexistent times
+    day_start = datetime.fromisoformat(result["start"]).astimezone(ZoneInfo(time_zone))
+    starts = slot_starts(day_start, len(result["prices"]) + 1, result["slot_minutes"])
+    labels = result.get("labels")
+    for i, (price, level) in enumerate(zip(result["prices"], result["levels"])):
+        row = [result["date"], starts[i].isoformat(), starts[i + 1].isoformat(), "" if price is None else price, level]
+        if labels is not None:
+            row.append(labels[i] or "")
+        writer.writerow(row)
+
+
+def build_config(cfg: dict[str, Any], time_zone: str, language: Optional[str] = None) -> BatchConfig:
+    """Batch settings from an entry config (keys as in `const.py`)."""
+    ZoneInfo(time_zone)  # fail early on unknown zones
+    labels = level_labels(_read_all_translations(), language) if language else None
+    return BatchConfig(
+        pcfg=price_config(cfg),
+        lcfg=level_config(cfg),
+        slot_minutes=RESOLUTION_SLOT_MINUTES.get(str(cfg.get(CONF_RESOLUTION, DEFAULT_RESOLUTION)), 60),
+        time_zone=time_zone,
+        labels=labels,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.power_price_level",
+        description="Compute Power Price prices and levels for stored Nordpool day records.",
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], help="JSON/JSONL files with day records (default: stdin)")
+    parser.add_argument("-c", "--config", required=True, help="JSON file with the entry config (keys as in const.py)")
+    parser.add_argument("-z", "--time-zone", required=True, help="Nordpool area time zone, e.g. Europe/Oslo")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="output format (default: jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-l", "--language", help="also output level labels in this language (e.g. nb)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as fh:
+        cfg = json.load(fh)
+    bcfg = build_config(cfg, args.time_zone, args.language)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    failed = 0
+    try:
+        writer = None
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(CSV_FIELDS + (["label"] if bcfg.labels is not None else []))
+        for loc, result in process(iter_records(args.inputs), bcfg, args.jobs):
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"{loc}: {result}", file=sys.stderr)
+            elif writer is not None:
+                _write_csv(writer, result, bcfg.time_zone)
+            else:
+                _write_jsonl(out, result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
@@ -3,13 +3,13 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from homeassistant.helpers import translation as translation_helper
 from homeassistant.helpers import selector
 
 
 from .options_flow import PowerPriceLevelOptionsFlowHandler
 from .const import (
     CONF_ADDITIONAL,
+    CONF_ATTRIBUTE_FORMAT,
     CONF_CHEAP_HOURS,
     CONF_CHEAP_HOURS_DAY,
     CONF_CHEAP_HOURS_EVENING,
@@ -26,9 +26,16 @@ from .const import (
     CONF_NIGHT_HOUR_END,
     CONF_NIGHT_HOUR_START,
     CONF_NORDPOOL_ENTITY,
+    CONF_RANKING,
+    CONF_RESOLUTION,
     CONF_SENSOR_NAME,
+    CONF_UPDATE_DEBOUNCE,
+    CONF_WINDOW_HOURS,
+    CONF_CUSTOM_LEVELS,
+    ATTRIBUTE_FORMAT_DISPLAY_MAP,
     CURRENCY_UNIT_MAP,
     DEFAULT_ADDITIONAL,
+    DEFAULT_ATTRIBUTE_FORMAT,
     DEFAULT_CHEAP_HOURS,
     DEFAULT_CHEAP_HOURS_DAY,
     DEFAULT_CHEAP_HOURS_EVENING,
@@ -46,10 +53,21 @@ from .const import (
     DEFAULT_NIGHT_HOUR_END,
     DEFAULT_NIGHT_HOUR_START,
     DEFAULT_NORDPOOL_ENTITY,
+    DEFAULT_RANKING,
+    DEFAULT_RESOLUTION,
+    DEFAULT_UPDATE_DEBOUNCE,
+    DEFAULT_WINDOW_HOURS,
+    DEFAULT_CUSTOM_LEVELS,
     DOMAIN,
     LANGUAGE_DISPLAY_MAP,
+    MAX_WINDOW_HOURS,
+    RANKING_DISPLAY_MAP,
+    RESOLUTION_DISPLAY_MAP,
 )
-from .util import parse_unit
+from .discovery import async_candidate_selector, async_nordpool_candidates
+from .labels import async_get_step_errors
+from .engine import PRICED_LEVEL_KEYS
+from .util import format_level_sets, parse_level_sets, parse_unit, parse_window_hours
 
 
 def _unit_to_str(v: float) -> str:
@@ -71,17 +89,6 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def async_get_options_flow(config_entry: config_entries.ConfigEntry):
         return PowerPriceLevelOptionsFlowHandler(config_entry)
 
-    def _find_nordpool_entity(self) -> str | None:
-        try:
-            for st in self.hass.states.async_all():
-                eid = (st.entity_id or "").lower()
-                name = str(st.attributes.get("friendly_name", "") or "").lower()
-                if "nordpool" in eid or "nordpool" in name:
-                    return st.entity_id
-        except Exception:
-            pass
-        return None
-
     async def async_step_user(self, user_input=None):
         """First (basic) step: Nordpool source and sensor name."""
         errors: dict[str, str] = {}
@@ -92,15 +99,15 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_SENSOR_NAME: DEFAULT_NAME,
             CONF_CURRENCY: DEFAULT_CURRENCY,
             CONF_LEVEL_LANGUAGE: DEFAULT_LEVEL_LANGUAGE,
+            CONF_RESOLUTION: DEFAULT_RESOLUTION,
+            CONF_ATTRIBUTE_FORMAT: DEFAULT_ATTRIBUTE_FORMAT,
+            CONF_UPDATE_DEBOUNCE: DEFAULT_UPDATE_DEBOUNCE,
         }
 
-        # Try to auto-detect an entity containing 'nordpool' if no explicit default
-        try:
-            candidate = self._find_nordpool_entity()
-            if candidate:
-                defaults[CONF_NORDPOOL_ENTITY] = candidate
-        except Exception:
-            pass
+        # Discovered Nordpool sensors, best first; the best one is the default
+        nordpool_candidates = async_nordpool_candidates(self.hass)
+        if nordpool_candidates:
+            defaults[CONF_NORDPOOL_ENTITY] = nordpool_candidates[0]
 
         if user_input is not None:
             try:
@@ -116,6 +123,9 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._temp[CONF_CURRENCY] = str(user_input.get(CONF_CURRENCY, DEFAULT_CURRENCY))
                 sel = user_input.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE)
                 self._temp[CONF_LEVEL_LANGUAGE] = LANGUAGE_DISPLAY_MAP.get(sel, sel)
+                self._temp[CONF_RESOLUTION] = str(user_input.get(CONF_RESOLUTION, DEFAULT_RESOLUTION))
+                self._temp[CONF_ATTRIBUTE_FORMAT] = str(user_input.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT))
+                self._temp[CONF_UPDATE_DEBOUNCE] = int(user_input.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE))
                 return await self.async_step_costs()
 
             except Exception:
@@ -125,7 +135,9 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         schema = vol.Schema(
             {
                 vol.Required(CONF_SENSOR_NAME, default=defaults[CONF_SENSOR_NAME]): str,
-                vol.Required(CONF_NORDPOOL_ENTITY, default=defaults[CONF_NORDPOOL_ENTITY]): selector.EntitySelector({"domain": "sensor"}),
+                vol.Required(CONF_NORDPOOL_ENTITY, default=defaults[CONF_NORDPOOL_ENTITY]): async_candidate_selector(
+                    self.hass, nordpool_candidates, defaults[CONF_NORDPOOL_ENTITY]
+                ),
                 vol.Required(
                     CONF_LEVEL_LANGUAGE,
                     default=(
@@ -138,6 +150,18 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_CURRENCY,
                     default=(defaults[CONF_CURRENCY] if defaults.get(CONF_CURRENCY) in ["NOK", "SEK", "DKK", "EUR"] else DEFAULT_CURRENCY),
                 ): vol.In(["NOK", "SEK", "DKK", "EUR"]),
+                vol.Required(
+                    CONF_RESOLUTION,
+                    default=(defaults[CONF_RESOLUTION] if defaults.get(CONF_RESOLUTION) in RESOLUTION_DISPLAY_MAP else DEFAULT_RESOLUTION),
+                ): vol.In(RESOLUTION_DISPLAY_MAP),
+                vol.Required(
+                    CONF_ATTRIBUTE_FORMAT,
+                    default=(defaults[CONF_ATTRIBUTE_FORMAT] if defaults.get(CONF_ATTRIBUTE_FORMAT) in ATTRIBUTE_FORMAT_DISPLAY_MAP else DEFAULT_ATTRIBUTE_FORMAT),
+                ): vol.In(ATTRIBUTE_FORMAT_DISPLAY_MAP),
+                vol.Required(
+                    CONF_UPDATE_DEBOUNCE,
+                    default=defaults[CONF_UPDATE_DEBOUNCE],
+                ): selector.NumberSelector({"min": 0, "max": 60, "step": 1, "mode": "box"}),
             }
         )
 
@@ -215,6 +239,9 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_CHEAP_HOURS_NIGHT: DEFAULT_CHEAP_HOURS_NIGHT,
             CONF_CHEAP_HOURS_DAY: DEFAULT_CHEAP_HOURS_DAY,
             CONF_CHEAP_HOURS_EVENING: DEFAULT_CHEAP_HOURS_EVENING,
+            CONF_RANKING: DEFAULT_RANKING,
+            CONF_WINDOW_HOURS: DEFAULT_WINDOW_HOURS,
+            CONF_CUSTOM_LEVELS: DEFAULT_CUSTOM_LEVELS,
         }
 
         # Merge any temp values we already collected
@@ -251,7 +278,20 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_CHEAP_HOURS_EVENING,
                     default=defaults[CONF_CHEAP_HOURS_EVENING],
                 ): selector.NumberSelector({"min": 0, "max": 8, "step": 1, "mode": "box"}),
-                
+                vol.Required(
+                    CONF_RANKING,
+                    default=(defaults[CONF_RANKING] if defaults.get(CONF_RANKING) in RANKING_DISPLAY_MAP else DEFAULT_RANKING),
+                ): vol.In(RANKING_DISPLAY_MAP),
+                # Comma separated hours; may be left empty
+                vol.Optional(
+                    CONF_WINDOW_HOURS,
+                    description={"suggested_value": defaults[CONF_WINDOW_HOURS]},
+                ): str,
+                # Level keys of custom binary sensors, e.g. "cheap, cheap_time; expensive"
+                vol.Optional(
+                    CONF_CUSTOM_LEVELS,
+                    description={"suggested_value": defaults[CONF_CUSTOM_LEVELS]},
+                ): str,
             }
         )
 
@@ -276,6 +316,12 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_CHEAP_HOURS_DAY: int(user_input[CONF_CHEAP_HOURS_DAY]),
                     CONF_CHEAP_HOURS_EVENING: int(user_input[CONF_CHEAP_HOURS_EVENING]),
                     CONF_LEVEL_LANGUAGE: str(self._temp.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE)),
+                    CONF_RESOLUTION: str(self._temp.get(CONF_RESOLUTION, DEFAULT_RESOLUTION)),
+                    CONF_ATTRIBUTE_FORMAT: str(self._temp.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT)),
+                    CONF_UPDATE_DEBOUNCE: int(self._temp.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE)),
+                    CONF_RANKING: str(user_input.get(CONF_RANKING, DEFAULT_RANKING)),
+                    CONF_WINDOW_HOURS: str(user_input.get(CONF_WINDOW_HOURS, "")).strip(),
+                    CONF_CUSTOM_LEVELS: str(user_input.get(CONF_CUSTOM_LEVELS, "")).strip(),
                 }
 
                 # proceed to validate and create entry
@@ -309,6 +355,18 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if data[CONF_CHEAP_HOURS_EVENING] > 8:
                     errors[CONF_CHEAP_HOURS_EVENING] = "max_8"
 
+                # window lengths: whole hours, stored normalized (e.g. "1, 3")
+                try:
+                    data[CONF_WINDOW_HOURS] = ", ".join(map(str, parse_window_hours(data[CONF_WINDOW_HOURS], MAX_WINDOW_HOURS)))
+                except ValueError:
+                    errors[CONF_WINDOW_HOURS] = "invalid_window_hours"
+
+                # custom level sets: known level keys, stored normalized (e.g. "cheap, cheap_time; expensive")
+                try:
+                    data[CONF_CUSTOM_LEVELS] = format_level_sets(parse_level_sets(data[CONF_CUSTOM_LEVELS], PRICED_LEVEL_KEYS))
+                except ValueError:
+                    errors[CONF_CUSTOM_LEVELS] = "invalid_custom_levels"
+
                 if errors:
                     defaults.update(user_input)
                     errors = await self._map_error_keys("config", "hours", errors)
@@ -327,7 +385,7 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(step_id="hours", data_schema=schema, errors=errors)
 
     async def _map_error_keys(self, domain_key: str, step_id: str, errors: dict[str, str]) -> dict[str, str]:
-        """Map translation keys in `errors` to localized strings using HA translation helper.
+        """Map translation keys in `errors` to localized strings from the bundled translations.
 
         Falls back to English and preserves unknown keys.
         """
@@ -338,58 +396,12 @@ class PowerPriceLevelConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         
 
+        # Error strings come from the shared translation cache (files are
+        # parsed once per integration load, not on every form error)
         try:
-            # Language-aware fallback: try several candidates (full locale,
-            # primary language) -> translations/en.json -> HA helper.
-            from pathlib import Path
-            import json
-
-            translations_dir = Path(__file__).resolve().parent / "translations"
-            translations = {}
-            loaded_from = None
-
-            # Build candidate language codes (preserve order)
-            candidates = []
-            if lang:
-                candidates.append(lang)
-                if "-" in lang:
-                    candidates.append(lang.split("-", 1)[0])
-                if "_" in lang:
-                    candidates.append(lang.split("_", 1)[0])
-            candidates.append("en")
-
-            tried = []
-            for cand in [] if candidates is None else candidates:
-                if not cand:
-                    continue
-                cand = cand.lower()
-                if cand in tried:
-                    continue
-                tried.append(cand)
-                p = translations_dir / f"{cand}.json"
-                if p.exists():
-                    try:
-                        def _read_json(path):
-                            with path.open("r", encoding="utf-8") as fh:
-                                return json.load(fh)
-
-                        translations = await self.hass.async_add_executor_job(_read_json, p)
-                        loaded_from = str(p)
-                        break
-                    except Exception:
-                        # logging removed
-                        pass
-
-            # Final fallback to HA helper if nothing loaded
-            if not translations:
-                translations = await translation_helper.async_get_translations(self.hass, DOMAIN, lang)
-                loaded_from = "ha_helper"
-            
+            errs = await async_get_step_errors(self.hass, lang, domain_key, step_id)
         except Exception:
-            translations = {}
-
-        step_obj = translations.get(domain_key, {}).get("step", {}).get(step_id, {})
-        errs = step_obj.get("errors", {}) if isinstance(step_obj, dict) else {}
+            errs = {}
 
         out: dict[str, str] = {}
         for k, v in errors.items():
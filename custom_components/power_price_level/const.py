@@ -1,5 +1,5 @@
 DOMAIN = "power_price_level"
-PLATFORMS = ["sensor"]
+PLATFORMS = ["sensor", "binary_sensor"]
 
 CONF_NORDPOOL_ENTITY = "nordpool_entity"
 CONF_POWERPRICE_ENTITY = "powerprice_entity"
@@ -52,6 +52,38 @@ CONF_GRID_NIGHT_END = "grid_night_end"
 DEFAULT_GRID_NIGHT_START = DEFAULT_NIGHT_HOUR_START
 DEFAULT_GRID_NIGHT_END = DEFAULT_NIGHT_HOUR_END
 
+# Event fired by the Power Price Level sensor when the current level changes
+EVENT_LEVEL_TRANSITION = f"{DOMAIN}_transition"
+
+# Seconds after Home Assistant has started to wait for a missing Nordpool
+# entity before the first (empty) computation
+SOURCE_WAIT_TIMEOUT = 120
+
+# Cooldown (seconds) for coalescing bursts of source updates: the first
+# update is handled at once, later ones within the cooldown in a single
+# recomputation at its end. 0 recomputes on every update.
+CONF_UPDATE_DEBOUNCE = "update_debounce"
+DEFAULT_UPDATE_DEBOUNCE = 2
+
+# Contiguous window lengths (hours) for the cheapest / most expensive window
+# attributes of the Power Price sensor, e.g. "1, 3"; empty disables them
+CONF_WINDOW_HOURS = "window_hours"
+DEFAULT_WINDOW_HOURS = "3"
+MAX_WINDOW_HOURS = 24
+
+# Binary sensors that are on while the current level is in their set of
+# level keys. The predefined ones are created disabled; `custom_levels` adds
+# one per set, e.g. "cheap, cheap_time; expensive" gives two
+BINARY_SENSOR_LEVELS = {
+	"cheap": ("cheap",),
+	"cheap_time": ("cheap", "cheapest_hour", "cheapest_hours", "cheap_time"),
+	"cheapest_hours": ("cheapest_hour", "cheapest_hours"),
+	"expensive": ("most_expensive_hour", "most_expensive_hours", "expensive"),
+	"most_expensive": ("most_expensive_hour", "most_expensive_hours"),
+}
+CONF_CUSTOM_LEVELS = "custom_levels"
+DEFAULT_CUSTOM_LEVELS = ""
+
 # Currency/unit selection
 CONF_CURRENCY = "currency"
 DEFAULT_CURRENCY = "NOK"
@@ -83,3 +115,46 @@ LANGUAGE_DISPLAY_MAP = {
 	"Svenska": "sv",
 }
 
+# Price/level resolution: classic hourly tables or native Nordpool quarter-hour slots
+CONF_RESOLUTION = "resolution"
+RESOLUTION_HOUR = "hour"
+RESOLUTION_QUARTER_HOUR = "quarter_hour"
+DEFAULT_RESOLUTION = RESOLUTION_HOUR
+
+# Slot length (minutes) per resolution
+RESOLUTION_SLOT_MINUTES = {
+	RESOLUTION_HOUR: 60,
+	RESOLUTION_QUARTER_HOUR: 15,
+}
+
+# Mapping for resolution selector value -> display
+RESOLUTION_DISPLAY_MAP = {
+	RESOLUTION_HOUR: "60 min",
+	RESOLUTION_QUARTER_HOUR: "15 min",
+}
+
+# Attribute format: standard (raw_today/raw_tomorrow, label tables) or compact
+# (series start + slot length with flat price / level-key arrays)
+CONF_ATTRIBUTE_FORMAT = "attribute_format"
+ATTRIBUTE_FORMAT_STANDARD = "standard"
+ATTRIBUTE_FORMAT_COMPACT = "compact"
+DEFAULT_ATTRIBUTE_FORMAT = ATTRIBUTE_FORMAT_STANDARD
+
+# Mapping for attribute format selector value -> display
+ATTRIBUTE_FORMAT_DISPLAY_MAP = {
+	ATTRIBUTE_FORMAT_STANDARD: "Standard",
+	ATTRIBUTE_FORMAT_COMPACT: "Compact",
+}
+
+# Level ranking horizon: each calendar day on its own, or rolling over the
+# remaining slots of today plus all published slots of tomorrow
+CONF_RANKING = "ranking"
+RANKING_DAY = "day"
+RANKING_ROLLING = "rolling"
+DEFAULT_RANKING = RANKING_DAY
+
+# Mapping for ranking selector value -> display
+RANKING_DISPLAY_MAP = {
+	RANKING_DAY: "Per day",
+	RANKING_ROLLING: "Rolling (today + tomorrow)",
+}
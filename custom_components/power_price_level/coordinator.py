@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .const import DOMAIN
+from .engine import quarterhour_to_hourly, to_quarterhour
+from .util import fingerprint
+
+# hass.data[DOMAIN] key holding the shared Nordpool sources (entity_id -> NordpoolSource)
+DATA_SOURCES = "sources"
+
+
+# ---------------------------
+# Shared Nordpool source
+# ---------------------------
+
+class NordpoolSource:
+    """One Nordpool entity, parsed once per change and shared by all entries using it.
+
+    Entries subscribe with `async_add_listener` and read the normalized spot
+    arrays with `spot()`. Normalization runs at most once per source change
+    and resolution, however many entries use the source.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        self.hass = hass
+        self.entity_id = entity_id
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub = None
+        self._today: list[Any] = []
+        self._tomorrow: list[Any] = []
+        # Content fingerprint of today/tomorrow; listeners are only called when it changes
+        self.fingerprint: int | None = None
+        # slot_minutes -> (today, tomorrow) normalized spot arrays
+        self._spot: dict[int, tuple[list[Optional[float]], list[Optional[float]]]] = {}
+        self._async_read_state()
+
+    @property
+    def available(self) -> bool:
+        return self.hass.states.get(self.entity_id) is not None
+
+    @callback
+    def _async_read_state(self) -> bool:
+        """Read today/tomorrow from the entity; return True if the prices changed."""
+        state = self.hass.states.get(self.entity_id)
+        attrs = (state.attributes if state else {}) or {}
+        today = attrs.get("today") or []
+        tomorrow = attrs.get("tomorrow") or []
+        new_fingerprint = fingerprint(today, tomorrow)
+        if new_fingerprint == self.fingerprint:
+            return False
+        self._today = today
+        self._tomorrow = tomorrow
+        self.fingerprint = new_fingerprint
+        self._spot = {}
+        return True
+
+    def spot(self, slot_minutes: int = 60) -> tuple[list[Optional[float]], list[Optional[float]]]:
+        """Return (today, tomorrow) spot prices normalized to `slot_minutes` slots.
+
+        One value per real slot: hourly data has 23/24/25 hours on DST days,
+        quarter-hour data keeps one value per MTU. Tomorrow is empty until
+        Nordpool publishes it.
+        """
+        cached = self._spot.get(slot_minutes)
+        if cached is None:
+            normalize = quarterhour_to_hourly if slot_minutes == 60 else to_quarterhour
+            cached = (
+                normalize(self._today),
+                normalize(self._tomorrow) if self._tomorrow else [],
+            )
+            self._spot[slot_minutes] = cached
+        return cached
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call `update_callback` whenever the source changes; returns the remove function."""
+        if not self._listeners:
+            self._async_read_state()
+            self._unsub = async_track_state_change_event(self.hass, [self.entity_id], self._async_source_changed)
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+            if not self._listeners:
+                self._async_shutdown()
+
+        return _remove
+
+    @callback
+    def _async_shutdown(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        sources = self.hass.data.get(DOMAIN, {}).get(DATA_SOURCES, {})
+        if sources.get(self.entity_id) is self:
+            sources.pop(self.entity_id, None)
+
+    @callback
+    def _async_source_changed(self, _event) -> None:
+        # Nordpool also writes for current-price and attribute churn; only
+        # fan out when today/tomorrow actually changed
+        if not self._async_read_state():
+            return
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+@callback
+def async_get_source(hass: HomeAssistant, entity_id: str) -> NordpoolSource:
+    """Return the shared source for a Nordpool entity, creating it on first use."""
+    sources = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SOURCES, {})
+    source = sources.get(entity_id)
+    if source is None:
+        source = NordpoolSource(hass, entity_id)
+        sources[entity_id] = source
+    return source
+
+
+# ---------------------------
+# Refresh debouncing
+# ---------------------------
+
+class RefreshDebouncer:
+    """Coalesce bursts of refresh requests into as few runs as possible.
+
+    The first request runs right away (leading edge). Requests arriving while
+    it runs or during the following `cooldown` seconds are merged into a
+    single run at the end of the cooldown. Unlike HA's `Debouncer`, a request
+    made while a run is in progress is never dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, cooldown: float, function: Callable[[], Awaitable[None]]) -> None:
+        self.hass = hass
+        self.cooldown = cooldown
+        self._function = function
+        self._running = False
+        self._pending = False
+        self._shutdown = False
+        self._unsub_timer = None
+
+    @callback
+    def async_schedule_call(self) -> None:
+        """Request a run; runs now unless one is running or cooling down."""
+        if self._shutdown:
+            return
+        if self._running or self._unsub_timer:
+            self._pending = True
+            return
+        self._async_start()
+
+    @callback
+    def _async_start(self) -> None:
+        self._running = True
+        self._pending = False
+        self.hass.async_create_task(self._async_run())
+
+    async def _async_run(self) -> None:
+        try:
+            await self._function()
+        finally:
+            self._running = False
+            if not self._shutdown:
+                if self.cooldown > 0:
+                    self._unsub_timer = async_call_later(self.hass, self.cooldown, self._async_cooldown_done)
+                elif self._pending:
+                    self._async_start()
+
+    @callback
+    def _async_cooldown_done(self, _now) -> None:
+        self._unsub_timer = None
+        if self._pending and not self._shutdown:
+            self._async_start()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel a pending run and ignore further requests."""
+        self._shutdown = True
+        self._pending = False
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+# ---------------------------
+# Per-entry runtime (price -> level -> binary sensor handoff)
+# ---------------------------
+
+@dataclass(frozen=True)
+class PriceResult:
+    """Price tables published by an entry's PowerPriceSensor (the `prices` attribute)."""
+
+    today: list[Optional[float]]
+    tomorrow: list[Optional[float]]
+    slot_minutes: int
+    # Local date `today` belongs to
+    day: date
+    # Input fingerprint of the price sensor when the tables were built
+    fingerprint: int
+    # True when `today` is the previous "tomorrow", promoted at midnight
+    promoted: bool = False
+
+
+@dataclass(frozen=True)
+class LevelResult:
+    """Level keys published by an entry's PowerPriceLevelSensor (the `levels` attribute)."""
+
+    today: list[str]
+    tomorrow: list[str]
+    slot_minutes: int
+    # Local date `today` belongs to
+    day: date
+    # Slot of `today` the level sensor currently shows
+    index: int
+
+
+class EntryRuntime:
+    """State shared by the sensors of one config entry.
+
+    The price sensor publishes its tables here and the level sensor of the
+    same entry recomputes from them directly, without a round trip through
+    the state machine. The level sensor in turn publishes its level keys
+    and current slot for the binary sensors. Option changes are handed to the running sensors
+    as the set of changed keys (see `async_apply_config`).
+    """
+
+    def __init__(self, entry: ConfigEntry) -> None:
+        # shallow copy of entry.data to avoid accidental mutation/race with entry updates
+        self.data: dict[str, Any] = dict(entry.data) if entry.data is not None else {}
+        # Effective config (options over data) the sensors currently run with
+        self.config: dict[str, Any] = dict(entry.options or entry.data or {})
+        self.price: PriceResult | None = None
+        self.levels: LevelResult | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._level_listeners: list[Callable[[], None]] = []
+        self._config_listeners: list[Callable[[set[str]], None]] = []
+
+    @callback
+    def async_publish_price(self, result: PriceResult) -> None:
+        """Store the latest price tables and notify listeners."""
+        self.price = result
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call `update_callback` whenever a price result is published; returns the remove function."""
+        return _async_add(self._listeners, update_callback)
+
+    @callback
+    def async_publish_levels(self, result: LevelResult) -> None:
+        """Store the latest level keys and slot and notify level listeners (only when they changed)."""
+        if result == self.levels:
+            return
+        self.levels = result
+        for update_callback in list(self._level_listeners):
+            update_callback()
+
+    @callback
+    def async_add_level_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call `update_callback` whenever a new level result is published; returns the remove function."""
+        return _async_add(self._level_listeners, update_callback)
+
+    @callback
+    def async_apply_config(self, entry: ConfigEntry) -> set[str]:
+        """Take over the entry's current config and notify listeners of the changed keys."""
+        config = dict(entry.options or entry.data or {})
+        changed = {key for key in self.config.keys() | config.keys() if self.config.get(key) != config.get(key)}
+        self.data = dict(entry.data) if entry.data is not None else {}
+        self.config = config
+        if changed:
+            for update_callback in list(self._config_listeners):
+                update_callback(changed)
+        return changed
+
+    @callback
+    def async_add_config_listener(self, update_callback: Callable[[set[str]], None]) -> Callable[[], None]:
+        """Call `update_callback(changed_keys)` when the entry's options change; returns the remove function."""
+        return _async_add(self._config_listeners, update_callback)
+
+
+@callback
+def _async_add(listeners: list[Callable], update_callback: Callable) -> Callable[[], None]:
+    listeners.append(update_callback)
+
+    @callback
+    def _remove() -> None:
+        if update_callback in listeners:
+            listeners.remove(update_callback)
+
+    return _remove
+
+
+@callback
+def async_get_runtime(hass: HomeAssistant, entry: ConfigEntry) -> EntryRuntime:
+    """Return the runtime of `entry`, creating it if setup has not done so yet."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    runtime = domain_data.get(entry.entry_id)
+    if not isinstance(runtime, EntryRuntime):
+        runtime = EntryRuntime(entry)
+        domain_data[entry.entry_id] = runtime
+    return runtime
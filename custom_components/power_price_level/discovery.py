@@ -0,0 +1,136 @@
+"""Discovery of Nordpool and Power Price entities for the config/options flows.
+
+Candidates come from the entity registry (by platform and unique id) through
+an index that is built once and rebuilt only after the registry changed,
+instead of scanning every state on each form.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import selector
+
+from .const import DOMAIN
+
+# hass.data[DOMAIN] key holding the registry index
+DATA_DISCOVERY = "discovery"
+
+# Registry platform of the Nordpool sensors
+NORDPOOL_PLATFORM = "nordpool"
+
+_POWER_PRICE_SUFFIX = "_power_price"
+
+
+class _RegistryIndex:
+    """Sensor entity ids by registry platform, rebuilt lazily after registry updates."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._by_platform: Optional[dict[str, list[er.RegistryEntry]]] = None
+        self._unsub = hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated)
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._unsub()
+
+    @callback
+    def _async_registry_updated(self, _event: Event) -> None:
+        self._by_platform = None
+
+    def platform(self, platform: str) -> list[er.RegistryEntry]:
+        if self._by_platform is None:
+            by_platform: dict[str, list[er.RegistryEntry]] = {}
+            for entry in er.async_get(self.hass).entities.values():
+                if entry.domain == "sensor" and not entry.disabled_by:
+                    by_platform.setdefault(entry.platform, []).append(entry)
+            self._by_platform = by_platform
+        return self._by_platform.get(platform, [])
+
+
+@callback
+def _async_get_index(hass: HomeAssistant) -> _RegistryIndex:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    index = domain_data.get(DATA_DISCOVERY)
+    if index is None:
+        index = _RegistryIndex(hass)
+        domain_data[DATA_DISCOVERY] = index
+    return index
+
+
+@callback
+def async_unload_discovery(hass: HomeAssistant) -> None:
+    """Drop the registry index and its listener (after the last entry unloaded)."""
+    index = hass.data.get(DOMAIN, {}).pop(DATA_DISCOVERY, None)
+    if index is not None:
+        index.async_shutdown()
+
+
+def _has_prices(hass: HomeAssistant, entity_id: str) -> bool:
+    state = hass.states.get(entity_id)
+    return state is not None and isinstance(state.attributes.get("today"), list)
+
+
+@callback
+def async_nordpool_candidates(hass: HomeAssistant) -> list[str]:
+    """Nordpool price sensors, best first.
+
+    Registered Nordpool sensors that currently carry a `today` price list
+    come first, then registered ones without prices (not loaded yet). Only
+    when the registry has none are the sensor states searched for entities
+    with Nordpool-style `today`/`raw_today` attributes (YAML setups without
+    a unique id).
+    """
+    entries = _async_get_index(hass).platform(NORDPOOL_PLATFORM)
+    if entries:
+        ids = sorted(entry.entity_id for entry in entries)
+        return sorted(ids, key=lambda entity_id: not _has_prices(hass, entity_id))
+
+    return sorted(
+        state.entity_id
+        for state in hass.states.async_all("sensor")
+        if isinstance(state.attributes.get("today"), list) and "raw_today" in state.attributes
+    )
+
+
+@callback
+def async_power_price_candidates(hass: HomeAssistant, entry_id: Optional[str] = None) -> list[str]:
+    """Power Price sensors of this integration; the one of `entry_id` first."""
+    own = f"{entry_id}{_POWER_PRICE_SUFFIX}" if entry_id else None
+    entries = [
+        entry
+        for entry in _async_get_index(hass).platform(DOMAIN)
+        if entry.unique_id.endswith(_POWER_PRICE_SUFFIX)
+    ]
+    entries.sort(key=lambda entry: (entry.unique_id != own, entry.entity_id))
+    return [entry.entity_id for entry in entries]
+
+
+@callback
+def async_candidate_selector(hass: HomeAssistant, candidates: list[str], current: Optional[str] = None) -> selector.Selector:
+    """Selector offering `candidates` in rank order (best first), labelled with their names.
+
+    The configured entity stays in the list even when it is no longer a
+    candidate, and other entity ids can still be typed in. Without any
+    candidates every sensor can be picked.
+    """
+    entity_ids = list(candidates)
+    if current and current not in entity_ids:
+        entity_ids.append(current)
+    if not entity_ids:
+        return selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor"))
+
+    def _label(entity_id: str) -> str:
+        state = hass.states.get(entity_id)
+        name = state.attributes.get("friendly_name") if state else None
+        return f"{name} ({entity_id})" if name else entity_id
+
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[selector.SelectOptionDict(value=entity_id, label=_label(entity_id)) for entity_id in entity_ids],
+            custom_value=True,
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        )
+    )
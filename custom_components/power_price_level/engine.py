@@ -0,0 +1,437 @@
+"""Price and level engine: plain data in, plain data out.
+
+Everything here is independent of Home Assistant (standard library and
+`const.py` only), so the math can be imported cheaply and run in batch
+jobs, benchmarks and profilers. The sensors in `sensor.py` wrap it.
+
+Day tables are lists with one value per real slot of the day: 23/24/25
+hours or 92/96/100 quarter-hours. Slot i starts `i * slot_minutes` after
+local midnight in real (UTC) time, and `slot_hours` holds the local hour of
+each slot (see `slot_hours()`). Without `slot_hours` slot i is taken as
+hour i, which is only right on days without a DST change.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from .const import (
+    CONF_ADDITIONAL,
+    CONF_CHEAP_HOURS,
+    CONF_CHEAP_HOURS_DAY,
+    CONF_CHEAP_HOURS_EVENING,
+    CONF_CHEAP_HOURS_NIGHT,
+    CONF_CHEAP_PRICE,
+    CONF_DAY_HOUR_END,
+    CONF_EXPENSIVE_HOURS,
+    CONF_GRID_DAY,
+    CONF_GRID_NIGHT,
+    CONF_GRID_NIGHT_END,
+    CONF_GRID_NIGHT_START,
+    CONF_NIGHT_HOUR_END,
+    DEFAULT_GRID_NIGHT_END,
+    DEFAULT_GRID_NIGHT_START,
+)
+
+# ---------------------------
+# Spot normalization (Nordpool)
+# ---------------------------
+
+def quarterhour_to_hourly(q: list[Any]) -> list[Optional[float]]:
+    """Average a quarter-hour list into one value per real hour (23/24/25 on DST days).
+
+    Hourly sources (up to 25 values) are returned as floats unchanged.
+    """
+    if not isinstance(q, list):
+        return []
+    if len(q) <= 25:
+        return [None if v is None else float(v) for v in q]
+
+    hourly: list[Optional[float]] = []
+    for start in range(0, len(q), 4):
+        vals = [v for v in q[start : start + 4] if v is not None]
+        hourly.append(sum(vals) / len(vals) if vals else None)
+    return hourly
+
+
+def to_quarterhour(q: list[Any]) -> list[Optional[float]]:
+    """Return Nordpool's quarter-hour list as floats (92/96/100 slots).
+
+    Hourly sources (23-25 values) are repeated into four quarter-hour slots.
+    """
+    if not isinstance(q, list):
+        return []
+    vals = [None if v is None else float(v) for v in q]
+    if len(vals) <= 25:
+        vals = [v for v in vals for _ in range(4)]
+    return vals
+
+
+def slot_starts(day_start: datetime, count: int, slot_minutes: int) -> list[datetime]:
+    """Start time of each slot of a day, stepping in UTC across DST changes.
+
+    `day_start` is local midnight (timezone aware); results are in its timezone.
+    """
+    tz = day_start.tzinfo
+    start = day_start.astimezone(timezone.utc)
+    return [(start + timedelta(minutes=slot_minutes * i)).astimezone(tz) for i in range(count)]
+
+
+def slot_hours(day_start: datetime, count: int, slot_minutes: int) -> list[int]:
+    """Local hour of each slot of a day (see `slot_starts`)."""
+    return [t.hour for t in slot_starts(day_start, count, slot_minutes)]
+
+
+# ---------------------------
+# Prices (spot + grid adders)
+# ---------------------------
+
+@dataclass(frozen=True)
+class PriceConfig:
+    grid_day: float
+    grid_night: float
+    grid_night_start: int
+    grid_night_end: int
+    additional: float
+
+
+def price_config(cfg: Mapping[str, Any], fallback: Mapping[str, Any] | None = None) -> PriceConfig:
+    """Read the grid/additional adders from options/data (keys as in `const.py`).
+
+    Adders missing from `cfg` are taken from `fallback` (e.g. `entry.data`).
+    """
+    fallback = fallback or {}
+    return PriceConfig(
+        grid_day=round(float(cfg.get(CONF_GRID_DAY, fallback.get(CONF_GRID_DAY, 0.0))), 4),
+        grid_night=round(float(cfg.get(CONF_GRID_NIGHT, fallback.get(CONF_GRID_NIGHT, 0.0))), 4),
+        grid_night_start=int(cfg.get(CONF_GRID_NIGHT_START, DEFAULT_GRID_NIGHT_START)),
+        grid_night_end=int(cfg.get(CONF_GRID_NIGHT_END, DEFAULT_GRID_NIGHT_END)),
+        additional=round(float(cfg.get(CONF_ADDITIONAL, fallback.get(CONF_ADDITIONAL, 0.0))), 4),
+    )
+
+
+def is_night_hour(hour: int, nighthourstart: int, nighthourend: int) -> bool:
+    # support wrapping night window
+    if nighthourstart < nighthourend:
+        return nighthourstart <= hour < nighthourend
+    return hour >= nighthourstart or hour < nighthourend
+
+
+def build_slot_prices(spot: list[Optional[float]], slot_hours: list[int], add_day_nok: float, add_night_nok: float, nighthourstart: int, nighthourend: int, additional: float = 0.0, fill_gaps: bool = True) -> list[Optional[float]]:
+    """Build a price list with one value per slot of the day.
+
+    `slot_hours` holds the local hour of each slot and selects the day/night
+    grid adder. With `fill_gaps` a missing spot price falls back to the
+    previous slot.
+    """
+    out: list[Optional[float]] = []
+    for i, v in enumerate(spot):
+        if v is None and fill_gaps and i > 0:
+            v = spot[i - 1]
+        if v is None:
+            out.append(None)
+            continue
+        add_nok = add_night_nok if is_night_hour(slot_hours[i], nighthourstart, nighthourend) else add_day_nok
+        out.append(round(v + add_nok + additional, 4))
+    return out
+
+
+def price_table(spot: list[Optional[float]], pcfg: PriceConfig, slot_hours: Optional[list[int]] = None) -> list[Optional[float]]:
+    """The `prices` table of one day: spot plus adders, gaps filled from the previous slot."""
+    if slot_hours is None:
+        slot_hours = list(range(len(spot)))
+    return build_slot_prices(spot, slot_hours, pcfg.grid_day, pcfg.grid_night, pcfg.grid_night_start, pcfg.grid_night_end, pcfg.additional)
+
+
+def state_table(spot: list[Optional[float]], pcfg: PriceConfig, slot_hours: Optional[list[int]] = None) -> list[Optional[float]]:
+    """Per-slot sensor state of one day (no gap filling; empty without spot prices)."""
+    if slot_hours is None:
+        slot_hours = list(range(len(spot)))
+    return build_slot_prices(spot, slot_hours, pcfg.grid_day, pcfg.grid_night, pcfg.grid_night_start, pcfg.grid_night_end, pcfg.additional, fill_gaps=False)
+
+
+# ---------------------------
+# Levels
+# ---------------------------
+
+# Level keys in code order (`LEVEL_KEYS[code]`); keys are the translation keys
+# under `sensor.power_price_level.state`
+LEVEL_KEYS = (
+    "unavailable",
+    "cheap",
+    "cheapest_hour",
+    "cheapest_hours",
+    "cheap_time",
+    "most_expensive_hour",
+    "most_expensive_hours",
+    "normal",
+    "expensive",
+)
+
+# Keys of slots that have a price (what level sets can be made of)
+PRICED_LEVEL_KEYS = LEVEL_KEYS[1:]
+
+@dataclass(frozen=True)
+class LevelConfig:
+    cheap_price_ore: float
+    night_hour_end: int
+    day_hour_end: int
+    cheap_hours: int
+    expensive_hours: int
+    cheap_hours_night: int
+    cheap_hours_day: int
+    cheap_hours_evening: int
+
+
+def level_config(cfg: Mapping[str, Any]) -> LevelConfig:
+    """Read the level rule settings from options/data (same defaults as before)."""
+    return LevelConfig(
+        cheap_price_ore=float(cfg.get(CONF_CHEAP_PRICE, 0.0)),
+        night_hour_end=int(cfg.get(CONF_NIGHT_HOUR_END, 0)),
+        day_hour_end=int(cfg.get(CONF_DAY_HOUR_END, 24)),
+        cheap_hours=int(cfg.get(CONF_CHEAP_HOURS, 0)),
+        expensive_hours=int(cfg.get(CONF_EXPENSIVE_HOURS, 0)),
+        cheap_hours_night=int(cfg.get(CONF_CHEAP_HOURS_NIGHT, 0)),
+        cheap_hours_day=int(cfg.get(CONF_CHEAP_HOURS_DAY, 0)),
+        cheap_hours_evening=int(cfg.get(CONF_CHEAP_HOURS_EVENING, 0)),
+    )
+
+
+def period_hits(order: list[int], keys: list[Optional[float]], members: set[int], count: int) -> set[int]:
+    """Return the hours of `members` whose price is among the `count` cheapest of that period.
+
+    `order` is the day's ascending argsort; walking it and keeping only the
+    period's hours yields the period's own sorted order without sorting again.
+    Equal prices share a rank, so a tie with the last selected price is a hit.
+    """
+    hits: set[int] = set()
+    if count <= 0:
+        return hits
+    pos = 0
+    last_key: Optional[float] = None
+    for idx in order:
+        if idx not in members:
+            continue
+        k = keys[idx]
+        if k != last_key:
+            if pos >= count:
+                break
+            last_key = k
+        hits.add(idx)
+        pos += 1
+    return hits
+
+
+def day_levels(day_prices: list[Optional[float]], lcfg: LevelConfig, slot_hours: Optional[list[int]] = None, slots_per_hour: int = 1) -> list[str]:
+    """Classify all slots of a day in one pass and return level keys.
+
+    The day is ranked once (a single argsort); every rule is then evaluated
+    from each slot's rank group, i.e. the sorted positions shared by all slots
+    with the same price at 4 decimals. Keys are the translation keys under
+    `sensor.power_price_level.state` (e.g. "cheapest_hour").
+
+    `slot_hours` gives the local hour of each slot (placing it in the level
+    periods; without it slot i is hour i) and the hour counts are scaled by
+    `slots_per_hour`. Only real slots are ranked: a 23-hour day has 23.
+    """
+    if not isinstance(day_prices, list):
+        return ["unavailable"] * len(slot_hours or [])
+    if slot_hours is None:
+        slot_hours = list(range(len(day_prices)))
+    n = len(slot_hours)
+    if len(day_prices) < n or n == 0:
+        return ["unavailable"] * n
+
+    day = day_prices[:n]
+    vals: list[Optional[float]] = [None if v is None else float(v) for v in day]
+    keys: list[Optional[float]] = [None if v is None else round(v, 4) for v in vals]
+    present = [i for i in range(n) if keys[i] is not None]
+    if not present:
+        return ["unavailable"] * n
+
+    # One argsort; hours without price sort last (as the template did)
+    order = sorted(present, key=keys.__getitem__)
+    return _classify(vals, keys, order, lcfg, slot_hours, slots_per_hour)
+
+
+def _classify(vals: list[Optional[float]], keys: list[Optional[float]], order: list[int], lcfg: LevelConfig, slot_hours: list[int], slots_per_hour: int) -> list[str]:
+    """Level keys of all slots from their ascending price `order` (slots with a price only)."""
+    n = len(vals)
+    count = len(order)
+    missing = n - count
+
+    # lo/hi: first and one-past-last ascending position of each hour's rank group
+    lo = [0] * n
+    hi = [0] * n
+    j = 0
+    while j < count:
+        k = j + 1
+        while k < count and keys[order[k]] == keys[order[j]]:
+            k += 1
+        for idx in order[j:k]:
+            lo[idx] = j
+            hi[idx] = k
+        j = k
+
+    averageprice = sum(v for v in vals if v is not None) / count
+
+    # Grouped selections exclude the single cheapest / most expensive position.
+    # The descending list has missing hours first, so "most expensive hour" only
+    # exists on a complete day.
+    sph = slots_per_hour
+    cheapest_end = min(1 + max(0, lcfg.cheap_hours) * sph, n)
+    expensive_end = min(1 + max(0, lcfg.expensive_hours) * sph, n)
+
+    # Level periods: night starts at 00:00 (CONF_NIGHT_HOUR_START only drives
+    # grid adders). A night end of 0 wraps to cover the whole day.
+    night_end = lcfg.night_hour_end
+    day_end = lcfg.day_hour_end
+    night = {i for i in range(n) if slot_hours[i] < night_end} if night_end > 0 else set(range(n))
+    daytime = {i for i in range(n) if night_end <= slot_hours[i] < day_end}
+    evening = {i for i in range(n) if slot_hours[i] >= day_end}
+    cheap_time = (
+        period_hits(order, keys, night, lcfg.cheap_hours_night * sph)
+        | period_hits(order, keys, daytime, lcfg.cheap_hours_day * sph)
+        | period_hits(order, keys, evening, lcfg.cheap_hours_evening * sph)
+    )
+
+    cheapprice = lcfg.cheap_price_ore
+    out: list[str] = []
+    for h in range(n):
+        v = vals[h]
+        if v is None:
+            out.append("unavailable")
+            continue
+        desc_lo = missing + count - hi[h]
+        desc_hi = missing + count - lo[h]
+        if cheapprice > 0 and v <= cheapprice:
+            out.append("cheap")
+        elif lo[h] == 0:
+            out.append("cheapest_hour")
+        elif lo[h] < cheapest_end and hi[h] > 1:
+            out.append("cheapest_hours")
+        elif h in cheap_time:
+            out.append("cheap_time")
+        elif missing == 0 and hi[h] == count:
+            out.append("most_expensive_hour")
+        elif desc_lo < expensive_end and desc_hi > 1:
+            out.append("most_expensive_hours")
+        elif v <= averageprice:
+            out.append("normal")
+        else:
+            out.append("expensive")
+    return out
+
+
+class HorizonRanking:
+    """Levels ranked over a rolling horizon instead of per calendar day.
+
+    `prices` is the known series (today's slots followed by tomorrow's).
+    `levels(first)` ranks slots `first`.. among themselves with the rules of
+    `day_levels`; the hour counts and period minimums then apply to the
+    whole horizon. The series is sorted once: as `first` advances, expired
+    slots are dropped from the sorted order in a linear pass and the rest
+    is classified again, so a slot boundary costs O(n) without a re-sort.
+    The levels are not updated incrementally; n is at most two days of slots.
+    """
+
+    def __init__(self, prices: list[Optional[float]], lcfg: LevelConfig, slot_hours: list[int], slots_per_hour: int = 1) -> None:
+        n = min(len(prices), len(slot_hours))
+        self._lcfg = lcfg
+        self._slot_hours = slot_hours[:n]
+        self._sph = slots_per_hour
+        self._vals: list[Optional[float]] = [None if v is None else float(v) for v in prices[:n]]
+        self._keys: list[Optional[float]] = [None if v is None else round(v, 4) for v in self._vals]
+        self._first = 0
+        self._order = sorted((i for i in range(n) if self._keys[i] is not None), key=self._keys.__getitem__)
+
+    def __len__(self) -> int:
+        return len(self._vals)
+
+    def levels(self, first: int) -> list[str]:
+        """Level keys of slots `first`.. (ranked among the remaining slots only)."""
+        n = len(self._vals)
+        if first >= n:
+            return []
+        if first < self._first:
+            # Going back (not expected): sort the horizon again
+            self._order = sorted((i for i in range(first, n) if self._keys[i] is not None), key=self._keys.__getitem__)
+        elif first > self._first:
+            self._order = [i for i in self._order if i >= first]
+        self._first = first
+        if not self._order:
+            return ["unavailable"] * (n - first)
+        return _classify(
+            self._vals[first:],
+            self._keys[first:],
+            [i - first for i in self._order],
+            self._lcfg,
+            self._slot_hours[first:],
+            self._sph,
+        )
+
+
+# ---------------------------
+# Contiguous windows
+# ---------------------------
+
+@dataclass(frozen=True)
+class WindowTable:
+    """Cheapest and most expensive contiguous windows of `length` slots.
+
+    Built once per price series (usually today and tomorrow joined).
+    `sums[s]` is the total of the window starting at slot s, or None when
+    it covers a missing price. `cheapest[i]`/`most_expensive[i]` is the
+    start of the best window starting at slot i or later (earliest on
+    ties), or None if there is none, so the best window still ahead is an
+    O(1) lookup at each slot.
+    """
+
+    length: int
+    sums: list[Optional[float]]
+    cheapest: list[Optional[int]]
+    most_expensive: list[Optional[int]]
+
+    def average(self, start: int) -> float:
+        return round(self.sums[start] / self.length, 4)
+
+
+def window_table(prices: list[Optional[float]], length: int) -> WindowTable:
+    """Window sums from prefix sums and the best window from each slot on (O(n)).
+
+    Each sum is the difference of two prefix sums rounded to 4 decimals (the
+    precision of the price table), so windows with equal real sums compare
+    equal and ties go to the earliest start instead of to accumulated
+    rounding error.
+    """
+    n = len(prices)
+    starts = n - length + 1 if length > 0 else 0
+    sums: list[Optional[float]] = [None] * max(starts, 0)
+    # prefix[i] / gaps[i]: total and number of missing prices of prices[:i]
+    prefix = [0.0] * (n + 1)
+    gaps = [0] * (n + 1)
+    for i, v in enumerate(prices):
+        prefix[i + 1] = prefix[i] + (v or 0.0)
+        gaps[i + 1] = gaps[i] + (v is None)
+    for s in range(len(sums)):
+        if gaps[s + length] == gaps[s]:
+            sums[s] = round(prefix[s + length] - prefix[s], 4)
+
+    # Backward pass: best start at or after each slot
+    cheapest: list[Optional[int]] = [None] * n
+    most_expensive: list[Optional[int]] = [None] * n
+    lo: Optional[int] = None
+    hi: Optional[int] = None
+    for i in range(n - 1, -1, -1):
+        s = sums[i] if i < len(sums) else None
+        if s is not None:
+            if lo is None or s <= sums[lo]:
+                lo = i
+            if hi is None or s >= sums[hi]:
+                hi = i
+        cheapest[i] = lo
+        most_expensive[i] = hi
+    return WindowTable(length=length, sums=sums, cheapest=cheapest, most_expensive=most_expensive)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+TRANSLATIONS_DIR = Path(__file__).resolve().parent / "translations"
+
+# hass.data[DOMAIN] key holding the parsed translation files (or the pending load)
+DATA_TRANSLATIONS = "translations"
+
+
+def _read_all_translations() -> dict[str, dict[str, Any]]:
+    """Parse every bundled translation file (runs in the executor)."""
+    out: dict[str, dict[str, Any]] = {}
+    for path in sorted(TRANSLATIONS_DIR.glob("*.json")):
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                out[path.stem.lower()] = json.load(fh)
+        except Exception:
+            pass
+    return out
+
+
+def level_labels(translations: dict[str, dict[str, Any]], lang: str | None) -> dict[str, str]:
+    """Level state labels for `lang` from parsed translations (primary language, then English)."""
+    for cand in _language_candidates(lang):
+        labels = translations.get(cand, {}).get("sensor", {}).get("power_price_level", {}).get("state", {}) or {}
+        if labels:
+            return labels
+    return {}
+
+
+def _language_candidates(lang: str | None) -> list[str]:
+    """Candidate language codes in lookup order: full locale, primary language, English."""
+    candidates: list[str] = []
+    if lang:
+        candidates.append(lang)
+        if "-" in lang:
+            candidates.append(lang.split("-", 1)[0])
+        if "_" in lang:
+            candidates.append(lang.split("_", 1)[0])
+    candidates.append("en")
+
+    out: list[str] = []
+    for cand in candidates:
+        cand = cand.lower()
+        if cand and cand not in out:
+            out.append(cand)
+    return out
+
+
+async def async_get_translations(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return all bundled translations keyed by language code.
+
+    The files are read once per integration load and shared by all entries,
+    sensors and flows. Concurrent first callers await the same executor job.
+    The cache is dropped when an entry is unloaded (see `async_unload_entry`).
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cached = domain_data.get(DATA_TRANSLATIONS)
+    if isinstance(cached, dict):
+        return cached
+
+    if cached is None:
+        cached = hass.async_add_executor_job(_read_all_translations)
+        domain_data[DATA_TRANSLATIONS] = cached
+
+    try:
+        translations = await cached
+    except Exception:
+        # allow a later caller to retry the load
+        if domain_data.get(DATA_TRANSLATIONS) is cached:
+            domain_data.pop(DATA_TRANSLATIONS, None)
+        return {}
+
+    domain_data[DATA_TRANSLATIONS] = translations
+    return translations
+
+
+async def async_get_level_labels(hass: HomeAssistant, lang: str | None) -> dict[str, str]:
+    """Return the level state labels for `lang` (falls back to primary language, then English)."""
+    return level_labels(await async_get_translations(hass), lang)
+
+
+async def async_get_step_errors(hass: HomeAssistant, lang: str | None, domain_key: str, step_id: str) -> dict[str, str]:
+    """Return the localized error strings of a config/options flow step."""
+    translations = await async_get_translations(hass)
+    for cand in _language_candidates(lang):
+        if cand in translations:
+            step_obj = translations[cand].get(domain_key, {}).get("step", {}).get(step_id, {})
+            return step_obj.get("errors", {}) if isinstance(step_obj, dict) else {}
+    return {}
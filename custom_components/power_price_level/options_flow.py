@@ -1,13 +1,7 @@
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime
-from homeassistant.helpers import entity_registry as er
-from homeassistant.util import slugify
-
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.helpers import translation as translation_helper
 from homeassistant.helpers import selector
 
 from .const import (
@@ -41,9 +35,27 @@ from .const import (
     DEFAULT_GRID_NIGHT_START,
     DEFAULT_GRID_NIGHT_END,
     LANGUAGE_DISPLAY_MAP,
-    DOMAIN,
+    CONF_RESOLUTION,
+    DEFAULT_RESOLUTION,
+    RESOLUTION_DISPLAY_MAP,
+    CONF_ATTRIBUTE_FORMAT,
+    DEFAULT_ATTRIBUTE_FORMAT,
+    ATTRIBUTE_FORMAT_DISPLAY_MAP,
+    CONF_UPDATE_DEBOUNCE,
+    DEFAULT_UPDATE_DEBOUNCE,
+    CONF_WINDOW_HOURS,
+    CONF_CUSTOM_LEVELS,
+    DEFAULT_WINDOW_HOURS,
+    DEFAULT_CUSTOM_LEVELS,
+    MAX_WINDOW_HOURS,
+    CONF_RANKING,
+    DEFAULT_RANKING,
+    RANKING_DISPLAY_MAP,
 )
-from .util import parse_unit
+from .discovery import async_candidate_selector, async_nordpool_candidates, async_power_price_candidates
+from .labels import async_get_step_errors
+from .engine import PRICED_LEVEL_KEYS
+from .util import format_level_sets, parse_level_sets, parse_unit, parse_window_hours
 
 
 def _unit_to_str(v: float) -> str:
@@ -57,107 +69,32 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._entry = config_entry
 
-    def _find_nordpool_entity(self) -> str | None:
-        try:
-            for st in self.hass.states.async_all():
-                eid = (st.entity_id or "").lower()
-                name = str(st.attributes.get("friendly_name", "") or "").lower()
-                if "nordpool" in eid or "nordpool" in name:
-                    return st.entity_id
-        except Exception:
-            pass
-        return None
-
-    def _find_powerprice_entity(self) -> str | None:
-        try:
-            for st in self.hass.states.async_all():
-                eid = (st.entity_id or "").lower()
-                name = str(st.attributes.get("friendly_name", "") or "").lower()
-                if "power_price" in eid or "power price" in name or "powerprice" in eid:
-                    return st.entity_id
-        except Exception:
-            pass
-        return None
-
-    # tracing/logging has been removed
-
-    async def _delayed_reload(self) -> None:
-        try:
-            await asyncio.sleep(1)
-            await self.hass.config_entries.async_reload(self._entry.entry_id)
-        except Exception:
-            # logging removed
-            pass
-
-    async def _delayed_update_title(self, new_title: str) -> None:
-        try:
-            await asyncio.sleep(0.5)
-            try:
-                self.hass.config_entries.async_update_entry(self._entry, title=new_title)
-            except Exception:
-                # logging removed
-                pass
-        except Exception:
-            # logging removed
-            pass
-
-        # Also update entity registry ids to match the new sensor name (power price and level)
-        try:
-            base = slugify(new_title)
-            ent_reg = er.async_get(self.hass)
-
-            # Power price sensor
-            uid_price = f"{self._entry.entry_id}_power_price"
-            entity_price_id = ent_reg.async_get_entity_id("sensor", DOMAIN, uid_price)
-            if entity_price_id:
-                new_price_id = f"sensor.{base}"
-                try:
-                    ent_reg.async_update_entity(entity_price_id, new_entity_id=new_price_id)
-                except Exception:
-                    # logging removed
-                    pass
-
-            # Power price level sensor
-            uid_level = f"{self._entry.entry_id}_power_price_level"
-            entity_level_id = ent_reg.async_get_entity_id("sensor", DOMAIN, uid_level)
-            if entity_level_id:
-                new_level_id = f"sensor.{base}_level"
-                try:
-                    ent_reg.async_update_entity(entity_level_id, new_entity_id=new_level_id)
-                except Exception:
-                    # logging removed
-                    pass
-        except Exception:
-            # logging removed
-            pass
-
     async def async_step_init(self, user_input=None):
         """Basic options: sensor name and core prices."""
         errors: dict[str, str] = {}
 
         current = self._entry.options or {}
 
-        # Determine nordpool default: prefer current/entry value, else auto-detect
-        nord_default = current.get(CONF_NORDPOOL_ENTITY, self._entry.data.get(CONF_NORDPOOL_ENTITY, None))
-        if not nord_default:
-            try:
-                nord_default = self._find_nordpool_entity()
-            except Exception:
-                nord_default = None
+        # Discovered entities, best first (offered in this order in the form)
+        nordpool_candidates = async_nordpool_candidates(self.hass)
+        power_candidates = async_power_price_candidates(self.hass, self._entry.entry_id)
 
-        # Determine powerprice default: prefer current/entry value, else auto-detect
+        # Defaults: prefer current/entry value, else the best candidate
+        nord_default = current.get(CONF_NORDPOOL_ENTITY, self._entry.data.get(CONF_NORDPOOL_ENTITY, None))
+        if not nord_default and nordpool_candidates:
+            nord_default = nordpool_candidates[0]
         power_default = current.get(CONF_POWERPRICE_ENTITY, self._entry.data.get(CONF_POWERPRICE_ENTITY, None))
-        if not power_default:
-            try:
-                power_default = self._find_powerprice_entity()
-            except Exception:
-                power_default = None
+        if not power_default and power_candidates:
+            power_default = power_candidates[0]
         defaults = {
             CONF_NORDPOOL_ENTITY: str(nord_default or DEFAULT_NORDPOOL_ENTITY),
             CONF_POWERPRICE_ENTITY: str(power_default or DEFAULT_POWERPRICE_ENTITY),
             CONF_SENSOR_NAME: str(current.get(CONF_SENSOR_NAME, self._entry.data.get(CONF_SENSOR_NAME, DEFAULT_NAME))),
             CONF_CURRENCY: str(current.get(CONF_CURRENCY, self._entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))),
             CONF_LEVEL_LANGUAGE: str(current.get(CONF_LEVEL_LANGUAGE, self._entry.data.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE))),
+            CONF_RESOLUTION: str(current.get(CONF_RESOLUTION, self._entry.data.get(CONF_RESOLUTION, DEFAULT_RESOLUTION))),
+            CONF_ATTRIBUTE_FORMAT: str(current.get(CONF_ATTRIBUTE_FORMAT, self._entry.data.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT))),
+            CONF_UPDATE_DEBOUNCE: int(current.get(CONF_UPDATE_DEBOUNCE, self._entry.data.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE))),
             CONF_GRID_DAY: _unit_to_str(float(current.get(CONF_GRID_DAY, self._entry.data.get(CONF_GRID_DAY, 0.0)))),
             CONF_GRID_NIGHT: _unit_to_str(float(current.get(CONF_GRID_NIGHT, self._entry.data.get(CONF_GRID_NIGHT, 0.0)))),
             CONF_ADDITIONAL: _unit_to_str(float(current.get(CONF_ADDITIONAL, self._entry.data.get(CONF_ADDITIONAL, 0.0)))),
@@ -173,12 +110,15 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                     # selected value is a display name (e.g. "Norsk"); map to code
                     level_lang_sel = user_input.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE)
                     level_lang = LANGUAGE_DISPLAY_MAP.get(level_lang_sel, level_lang_sel).strip()
+                    resolution = str(user_input.get(CONF_RESOLUTION, DEFAULT_RESOLUTION))
+                    attribute_format = str(user_input.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT))
+                    update_debounce = int(user_input.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE))
                     if not nord:
                         raise ValueError("nordpool entity empty")
                     if not name:
                         raise ValueError("sensor name empty")
 
-                    self._temp = {CONF_NORDPOOL_ENTITY: nord, CONF_POWERPRICE_ENTITY: power, CONF_SENSOR_NAME: name, CONF_CURRENCY: currency, CONF_LEVEL_LANGUAGE: level_lang}
+                    self._temp = {CONF_NORDPOOL_ENTITY: nord, CONF_POWERPRICE_ENTITY: power, CONF_SENSOR_NAME: name, CONF_CURRENCY: currency, CONF_LEVEL_LANGUAGE: level_lang, CONF_RESOLUTION: resolution, CONF_ATTRIBUTE_FORMAT: attribute_format, CONF_UPDATE_DEBOUNCE: update_debounce}
                     return await self.async_step_costs()
                 except Exception:
                     errors["base"] = "invalid_input"
@@ -186,8 +126,12 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
         schema = vol.Schema(
             {
                 vol.Required(CONF_SENSOR_NAME, default=defaults[CONF_SENSOR_NAME]): str,
-                vol.Required(CONF_NORDPOOL_ENTITY, default=defaults[CONF_NORDPOOL_ENTITY]): selector.EntitySelector({"domain": "sensor"}),
-                vol.Required(CONF_POWERPRICE_ENTITY, default=defaults[CONF_POWERPRICE_ENTITY]): selector.EntitySelector({"domain": "sensor"}),
+                vol.Required(CONF_NORDPOOL_ENTITY, default=defaults[CONF_NORDPOOL_ENTITY]): async_candidate_selector(
+                    self.hass, nordpool_candidates, defaults[CONF_NORDPOOL_ENTITY]
+                ),
+                vol.Required(CONF_POWERPRICE_ENTITY, default=defaults[CONF_POWERPRICE_ENTITY]): async_candidate_selector(
+                    self.hass, power_candidates, defaults[CONF_POWERPRICE_ENTITY]
+                ),
                 vol.Required(
                     CONF_LEVEL_LANGUAGE,
                     default=(
@@ -200,6 +144,18 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_CURRENCY,
                     default=(defaults[CONF_CURRENCY] if defaults.get(CONF_CURRENCY) in ["NOK", "SEK", "DKK", "EUR"] else DEFAULT_CURRENCY),
                 ): vol.In(["NOK", "SEK", "DKK", "EUR"]),
+                vol.Required(
+                    CONF_RESOLUTION,
+                    default=(defaults[CONF_RESOLUTION] if defaults.get(CONF_RESOLUTION) in RESOLUTION_DISPLAY_MAP else DEFAULT_RESOLUTION),
+                ): vol.In(RESOLUTION_DISPLAY_MAP),
+                vol.Required(
+                    CONF_ATTRIBUTE_FORMAT,
+                    default=(defaults[CONF_ATTRIBUTE_FORMAT] if defaults.get(CONF_ATTRIBUTE_FORMAT) in ATTRIBUTE_FORMAT_DISPLAY_MAP else DEFAULT_ATTRIBUTE_FORMAT),
+                ): vol.In(ATTRIBUTE_FORMAT_DISPLAY_MAP),
+                vol.Required(
+                    CONF_UPDATE_DEBOUNCE,
+                    default=defaults[CONF_UPDATE_DEBOUNCE],
+                ): selector.NumberSelector({"min": 0, "max": 60, "step": 1, "mode": "box"}),
             }
         )
 
@@ -284,6 +240,9 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_CHEAP_HOURS_DAY: int(current.get(CONF_CHEAP_HOURS_DAY, self._entry.data.get(CONF_CHEAP_HOURS_DAY, 2))),
             CONF_CHEAP_HOURS_EVENING: int(current.get(CONF_CHEAP_HOURS_EVENING, self._entry.data.get(CONF_CHEAP_HOURS_EVENING, 2))),
         }
+        window_default = str(current.get(CONF_WINDOW_HOURS, self._entry.data.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS)))
+        custom_levels_default = str(current.get(CONF_CUSTOM_LEVELS, self._entry.data.get(CONF_CUSTOM_LEVELS, DEFAULT_CUSTOM_LEVELS)))
+        ranking_default = str(current.get(CONF_RANKING, self._entry.data.get(CONF_RANKING, DEFAULT_RANKING)))
 
         # If we have temp from prior steps, prefer that for hours/other fields
         if hasattr(self, "_temp") and self._temp:
@@ -327,7 +286,20 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_CHEAP_HOURS_EVENING,
                     default=defaults[CONF_CHEAP_HOURS_EVENING],
                 ): selector.NumberSelector({"min": 0, "max": 8, "step": 1, "mode": "box"}),
-                
+                vol.Required(
+                    CONF_RANKING,
+                    default=(ranking_default if ranking_default in RANKING_DISPLAY_MAP else DEFAULT_RANKING),
+                ): vol.In(RANKING_DISPLAY_MAP),
+                # Comma separated hours; may be left empty
+                vol.Optional(
+                    CONF_WINDOW_HOURS,
+                    description={"suggested_value": window_default},
+                ): str,
+                # Level keys of custom binary sensors, e.g. "cheap, cheap_time; expensive"
+                vol.Optional(
+                    CONF_CUSTOM_LEVELS,
+                    description={"suggested_value": custom_levels_default},
+                ): str,
             }
         )
 
@@ -344,6 +316,9 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SENSOR_NAME: str(temp.get(CONF_SENSOR_NAME, self._entry.data.get(CONF_SENSOR_NAME, DEFAULT_NAME))).strip(),
                     CONF_CURRENCY: str(temp.get(CONF_CURRENCY, self._entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))),
                     CONF_LEVEL_LANGUAGE: str(temp.get(CONF_LEVEL_LANGUAGE, self._entry.data.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE))),
+                    CONF_RESOLUTION: str(temp.get(CONF_RESOLUTION, self._entry.data.get(CONF_RESOLUTION, DEFAULT_RESOLUTION))),
+                    CONF_ATTRIBUTE_FORMAT: str(temp.get(CONF_ATTRIBUTE_FORMAT, self._entry.data.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT))),
+                    CONF_UPDATE_DEBOUNCE: int(temp.get(CONF_UPDATE_DEBOUNCE, self._entry.data.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE))),
                     CONF_GRID_DAY: parse_unit(str(temp.get(CONF_GRID_DAY, self._entry.data.get(CONF_GRID_DAY, 0.0)))),
                     CONF_GRID_NIGHT: parse_unit(str(temp.get(CONF_GRID_NIGHT, self._entry.data.get(CONF_GRID_NIGHT, 0.0)))),
                     CONF_GRID_NIGHT_START: int(temp.get(CONF_GRID_NIGHT_START, self._entry.data.get(CONF_GRID_NIGHT_START, DEFAULT_GRID_NIGHT_START))),
@@ -358,6 +333,9 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_CHEAP_HOURS_NIGHT: int(user_input[CONF_CHEAP_HOURS_NIGHT]),
                     CONF_CHEAP_HOURS_DAY: int(user_input[CONF_CHEAP_HOURS_DAY]),
                     CONF_CHEAP_HOURS_EVENING: int(user_input[CONF_CHEAP_HOURS_EVENING]),
+                    CONF_RANKING: str(user_input.get(CONF_RANKING, DEFAULT_RANKING)),
+                    CONF_WINDOW_HOURS: str(user_input.get(CONF_WINDOW_HOURS, "")).strip(),
+                    CONF_CUSTOM_LEVELS: str(user_input.get(CONF_CUSTOM_LEVELS, "")).strip(),
                 }
 
                 # proceed to validate and save options
@@ -391,16 +369,30 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
                 if options[CONF_CHEAP_HOURS_EVENING] > 8:
                     errors[CONF_CHEAP_HOURS_EVENING] = "max_8"
 
+                # window lengths: whole hours, stored normalized (e.g. "1, 3")
+                try:
+                    options[CONF_WINDOW_HOURS] = ", ".join(map(str, parse_window_hours(options[CONF_WINDOW_HOURS], MAX_WINDOW_HOURS)))
+                except ValueError:
+                    errors[CONF_WINDOW_HOURS] = "invalid_window_hours"
+
+                # custom level sets: known level keys, stored normalized (e.g. "cheap, cheap_time; expensive")
+                try:
+                    options[CONF_CUSTOM_LEVELS] = format_level_sets(parse_level_sets(options[CONF_CUSTOM_LEVELS], PRICED_LEVEL_KEYS))
+                except ValueError:
+                    errors[CONF_CUSTOM_LEVELS] = "invalid_custom_levels"
+
                 if errors:
                     errors = await self._map_error_keys("options", "more", errors)
                     return self.async_show_form(step_id="more", data_schema=schema, errors=errors)
 
                 # Save options as the entry's options (create_entry from OptionsFlow stores options)
                 try:
-                    # Schedule a background reload after saving options to apply changes immediately
+                    # The entry update listener applies the new options to the
+                    # running sensors (names included); entity ids are left alone
+                    # so nothing is torn down
                     new_title = str(options.get(CONF_SENSOR_NAME) or DEFAULT_NAME).strip()
-                    self.hass.async_create_task(self._delayed_update_title(new_title))
-                    self.hass.async_create_task(self._delayed_reload())
+                    if new_title != self._entry.title:
+                        self.hass.config_entries.async_update_entry(self._entry, title=new_title)
 
                     result = self.async_create_entry(title="", data=options)
                     return result
@@ -416,7 +408,7 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
         return self.async_show_form(step_id="more", data_schema=schema, errors=errors)
 
     async def _map_error_keys(self, domain_key: str, step_id: str, errors: dict[str, str]) -> dict[str, str]:
-        """Map translation keys in `errors` to localized strings using HA translation helper.
+        """Map translation keys in `errors` to localized strings from the bundled translations.
 
         Falls back to English and preserves unknown keys.
         """
@@ -427,58 +419,12 @@ class PowerPriceLevelOptionsFlowHandler(config_entries.OptionsFlow):
 
         
 
+        # Error strings come from the shared translation cache (files are
+        # parsed once per integration load, not on every form error)
         try:
-            # Language-aware fallback: try several candidates (full locale,
-            # primary language) -> translations/en.json -> HA helper.
-            from pathlib import Path
-            import json
-
-            translations_dir = Path(__file__).resolve().parent / "translations"
-            translations = {}
-            loaded_from = None
-
-            # Build candidate language codes (preserve order)
-            candidates = []
-            if lang:
-                candidates.append(lang)
-                if "-" in lang:
-                    candidates.append(lang.split("-", 1)[0])
-                if "_" in lang:
-                    candidates.append(lang.split("_", 1)[0])
-            candidates.append("en")
-
-            tried = []
-            for cand in [] if candidates is None else candidates:
-                if not cand:
-                    continue
-                cand = cand.lower()
-                if cand in tried:
-                    continue
-                tried.append(cand)
-                p = translations_dir / f"{cand}.json"
-                if p.exists():
-                    try:
-                        def _read_json(path):
-                            with path.open("r", encoding="utf-8") as fh:
-                                return json.load(fh)
-
-                        translations = await self.hass.async_add_executor_job(_read_json, p)
-                        loaded_from = str(p)
-                        break
-                    except Exception:
-                        # logging removed
-                        pass
-
-            # Final fallback to HA helper if nothing loaded
-            if not translations:
-                translations = await translation_helper.async_get_translations(self.hass, DOMAIN, lang)
-                loaded_from = "ha_helper"
-            
+            errs = await async_get_step_errors(self.hass, lang, domain_key, step_id)
         except Exception:
-            translations = {}
-
-        step_obj = translations.get(domain_key, {}).get("step", {}).get(step_id, {})
-        errs = step_obj.get("errors", {}) if isinstance(step_obj, dict) else {}
+            errs = {}
 
         out: dict[str, str] = {}
         for k, v in errors.items():
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import timedelta
+from abc import abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.start import async_at_started
 from homeassistant.util import dt as dt_util
-from homeassistant.helpers import translation as translation_helper
 
 from .const import (
     DOMAIN,
@@ -42,112 +48,150 @@ from .const import (
     DEFAULT_GRID_NIGHT_START,
     DEFAULT_GRID_NIGHT_END,
     CURRENCY_UNIT_MAP,
+    CONF_RESOLUTION,
+    DEFAULT_RESOLUTION,
+    RESOLUTION_SLOT_MINUTES,
+    CONF_ATTRIBUTE_FORMAT,
+    DEFAULT_ATTRIBUTE_FORMAT,
+    ATTRIBUTE_FORMAT_COMPACT,
+    SOURCE_WAIT_TIMEOUT,
+    CONF_UPDATE_DEBOUNCE,
+    DEFAULT_UPDATE_DEBOUNCE,
+    CONF_WINDOW_HOURS,
+    DEFAULT_WINDOW_HOURS,
+    MAX_WINDOW_HOURS,
+    CONF_RANKING,
+    DEFAULT_RANKING,
+    RANKING_ROLLING,
+    EVENT_LEVEL_TRANSITION,
 )
 
 from .const import LANGUAGE_DISPLAY_MAP
+from .coordinator import LevelResult, PriceResult, RefreshDebouncer, async_get_runtime, async_get_source
+from .engine import (
+    HorizonRanking,
+    day_levels,
+    level_config,
+    price_config,
+    price_table,
+    slot_hours,
+    slot_starts,
+    state_table,
+    WindowTable,
+    window_table,
+)
+from .labels import async_get_level_labels
+from .util import fingerprint, parse_window_hours
 
 # Use the central currency -> unit mapping from const.py
 _CURRENCY_UNIT_MAP = CURRENCY_UNIT_MAP
 
+# Options that change the price tables; the level tables of the same entry
+# follow through the price -> level handoff
+_PRICE_OPTIONS = frozenset({
+    CONF_NORDPOOL_ENTITY,
+    CONF_GRID_DAY,
+    CONF_GRID_NIGHT,
+    CONF_GRID_NIGHT_START,
+    CONF_GRID_NIGHT_END,
+    CONF_ADDITIONAL,
+    CONF_CURRENCY,
+    CONF_RESOLUTION,
+    CONF_ATTRIBUTE_FORMAT,
+})
+
+# Options that change the level tables (ranking rules and their input)
+_LEVEL_OPTIONS = frozenset({
+    CONF_POWERPRICE_ENTITY,
+    CONF_CHEAP_PRICE,
+    CONF_NIGHT_HOUR_START,
+    CONF_NIGHT_HOUR_END,
+    CONF_DAY_HOUR_END,
+    CONF_CHEAP_HOURS,
+    CONF_EXPENSIVE_HOURS,
+    CONF_CHEAP_HOURS_NIGHT,
+    CONF_CHEAP_HOURS_DAY,
+    CONF_CHEAP_HOURS_EVENING,
+    CONF_RESOLUTION,
+    CONF_ATTRIBUTE_FORMAT,
+    CONF_RANKING,
+})
+
+# Options a stored table depends on; cosmetic ones (name, language, window
+# lengths, debounce) are applied to a restored table instead
+_TABLE_OPTIONS = _PRICE_OPTIONS | _LEVEL_OPTIONS
+
 # ---------------------------
-# Helpers (Power Price)
+# Helpers (slot tables)
 # ---------------------------
 
-def _quarterhour_to_hourly(q: list[Any]) -> list[Optional[float]]:
-    """Convert quarter-hour list into hourly averages with DST handling (23/25h)."""
-    hourly: list[Optional[float]] = []
-    if not isinstance(q, list):
-        return hourly
-
-    hour_count = (len(q) + 3) // 4
-    for h in range(hour_count):
-        start = h * 4
-        sl = q[start : start + 4]
-        vals = [v for v in sl if v is not None]
-        hourly.append(sum(vals) / len(vals) if vals else None)
-
-    # DST adjustments (match your earlier template approach)
-    if len(hourly) == 23 and len(hourly) >= 2:
-        hourly = hourly[0:2] + [hourly[1]] + hourly[2:]
-    elif len(hourly) == 25:
-        if len(hourly) >= 4 and hourly[2] is not None and hourly[3] is not None:
-            merged = (hourly[2] + hourly[3]) / 2
-        else:
-            merged = hourly[2] if len(hourly) > 2 else None
-        hourly = hourly[0:2] + [merged] + hourly[4:]
+def _next_slot_start(now: datetime, slot_minutes: int = 60) -> datetime:
+    """Return the first slot boundary after `now`.
 
-    return hourly
+    Computed in UTC so the boundary is well defined across DST changes.
+    """
+    now = dt_util.as_utc(now)
+    floor = now.replace(minute=now.minute - now.minute % slot_minutes, second=0, microsecond=0)
+    return floor + timedelta(minutes=slot_minutes)
 
 
-def _build_24_prices(hourly: list[Optional[float]], add_nok: float, dst_23: bool, additional: float = 0.0) -> list[Optional[float]]:
-    """Build 24-hour price list with 23-hour DST correction + your hour 3 placeholder.
+def _slot_minutes(cfg: dict[str, Any]) -> int:
+    """Slot length in minutes for the configured resolution."""
+    return RESOLUTION_SLOT_MINUTES.get(str(cfg.get(CONF_RESOLUTION, DEFAULT_RESOLUTION)), 60)
 
-    `additional` is a fixed per-hour adder applied to all hours.
-    """
-    out: list[Optional[float]] = []
-    for i in range(24):
-        hour = i + 1
-        idx = i - 1 if (dst_23 and i >= 2) else i
 
-        val: Optional[float] = None
-        if 0 <= idx < len(hourly):
-            v = hourly[idx]
-            if v is not None:
-                val = round(v + add_nok + additional, 4)
-            else:
-                if idx - 1 >= 0 and (prev := hourly[idx - 1]) is not None:
-                    val = round(prev + add_nok + additional, 4)
+def _is_compact(cfg: dict[str, Any]) -> bool:
+    """True when the entry publishes the compact (columnar) attribute format."""
+    return str(cfg.get(CONF_ATTRIBUTE_FORMAT, DEFAULT_ATTRIBUTE_FORMAT)) == ATTRIBUTE_FORMAT_COMPACT
 
-        # DST placeholder from your template
-        if dst_23 and hour == 3:
-            val = 10.0000
 
-        out.append(val)
+def _is_rolling(cfg: dict[str, Any]) -> bool:
+    """True when levels are ranked over the rolling today+tomorrow horizon."""
+    return str(cfg.get(CONF_RANKING, DEFAULT_RANKING)) == RANKING_ROLLING
 
-    return out
 
+def _update_debounce(cfg: dict[str, Any]) -> float:
+    """Refresh cooldown in seconds (0 disables debouncing)."""
+    try:
+        return max(0.0, float(cfg.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE)))
+    except (TypeError, ValueError):
+        return float(DEFAULT_UPDATE_DEBOUNCE)
 
-def _build_24_prices(hourly: list[Optional[float]], add_day_nok: float, add_night_nok: float, nighthourstart: int, nighthourend: int, dst_23: bool, additional: float = 0.0) -> list[Optional[float]]:
-    """Build 24-hour price list applying day/night grid additions per hour.
 
-    Handles night windows that wrap across midnight.
-    """
-    out: list[Optional[float]] = []
-    for i in range(24):
-        hour = i
-        idx = i - 1 if (dst_23 and i >= 2) else i
-
-        # determine whether this hour is in the night window
-        if nighthourstart < nighthourend:
-            is_night = nighthourstart <= hour < nighthourend
-        else:
-            is_night = hour >= nighthourstart or hour < nighthourend
+def _window_hours(cfg: dict[str, Any]) -> tuple[int, ...]:
+    """Configured contiguous window lengths in hours (none if the value is invalid)."""
+    try:
+        return parse_window_hours(cfg.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS), MAX_WINDOW_HOURS)
+    except (TypeError, ValueError):
+        return ()
+
 
-        add_nok = add_night_nok if is_night else add_day_nok
+def _config_hash(cfg: dict[str, Any]) -> int:
+    """Fingerprint of the table options in `cfg` (see `_TABLE_OPTIONS`)."""
+    return fingerprint({key: cfg.get(key) for key in _TABLE_OPTIONS})
 
-        val: Optional[float] = None
-        if 0 <= idx < len(hourly):
-            v = hourly[idx]
-            if v is not None:
-                val = round(v + add_nok + additional, 4)
-            else:
-                if idx - 1 >= 0 and (prev := hourly[idx - 1]) is not None:
-                    val = round(prev + add_nok + additional, 4)
 
-        # DST placeholder (keep previous behavior: hour index 2 -> displayed as 3)
-        if dst_23 and (hour + 1) == 3:
-            val = 10.0000
+def _slot_index(now: datetime, slot_minutes: int) -> int:
+    """Index of the slot containing `now` in its local day table.
 
-        out.append(val)
+    Slots are keyed by real time since local midnight, so DST days have
+    23/25 hours (92/100 quarter-hours) and the lookup is O(1).
+    """
+    elapsed = dt_util.as_utc(now) - dt_util.as_utc(dt_util.start_of_local_day(now))
+    return int(elapsed.total_seconds() // (slot_minutes * 60))
 
-    return out
 
+def _raw_slots(starts: list[datetime], values: list[Optional[float]], slot_minutes: int) -> list[dict[str, Any]]:
+    """Nordpool-like `raw_today`/`raw_tomorrow` entries.
 
-def _k(price: Optional[float]) -> Optional[str]:
-    """Key used for membership checks: match Jinja-ish string behavior with stable rounding."""
-    if price is None:
-        return None
-    return f"{float(price):.4f}"
+    Each end is its start plus one slot in UTC, so on DST days the slots
+    neither overlap (fall back) nor end at a nonexistent time (spring forward).
+    """
+    step = timedelta(minutes=slot_minutes)
+    return [
+        {"start": t.isoformat(), "end": dt_util.as_local(dt_util.as_utc(t) + step).isoformat(), "value": float(v or 0.0)}
+        for t, v in zip(starts, values)
+    ]
 
 
 # ---------------------------
@@ -162,16 +206,222 @@ class _PriceCfg:
     additional_ore: float
 
 
-@dataclass(frozen=True)
-class _LevelCfg:
-    cheap_price_ore: float
-    night_hour_end: int
-    day_hour_end: int
-    cheap_hours: int
-    expensive_hours: int
-    cheap_hours_night: int
-    cheap_hours_day: int
-    cheap_hours_evening: int
+@dataclass
+class _TableExtraData(ExtraStoredData):
+    """Last computed day table, stored across restarts."""
+
+    day: str
+    slot_minutes: int
+    table: list[Any]
+    attrs: dict[str, Any]
+    # Input fingerprint behind the table and fingerprint of the table options it was built with
+    fingerprint: Optional[int]
+    config_hash: int
+    # Tomorrow's table, promoted at midnight
+    next_table: Optional[list[Any]] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Optional["_TableExtraData"]:
+        try:
+            return cls(
+                day=str(data["day"]),
+                slot_minutes=int(data["slot_minutes"]),
+                table=list(data["table"]),
+                attrs=dict(data["attrs"]),
+                fingerprint=data.get("fingerprint"),
+                config_hash=int(data["config_hash"]),
+                next_table=data.get("next_table"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+# ---------------------------
+# Slot scheduling
+# ---------------------------
+
+class _SlotTableSensor(SensorEntity, RestoreEntity):
+    """Sensor whose state is one slot of a precomputed day table.
+
+    A single point-in-time timer is armed at the next slot boundary (or the
+    later point `_next_wakeup` gives). When it fires, the state is
+    re-indexed into the cached table instead of running the full update;
+    only a table for another day triggers a recompute.
+
+    Updates are event driven (no polling) and state is only written when the
+    state, name, unit or attributes differ from the last write. Refresh
+    requests go through a `RefreshDebouncer`: the first one runs at once and
+    a burst of later ones is coalesced into one run after the cooldown.
+
+    Tomorrow's table is kept as well and promoted at local midnight, so the
+    new day is served from 00:00 without a recompute; the sources are only
+    checked again when they next change.
+
+    The table, attributes and input fingerprint are stored across restarts.
+    A table for today built with the current config is served right away,
+    and is kept when the fresh inputs have the same fingerprint.
+
+    Entities are abstract base classes already; subclasses implement
+    `_select_slot` for their own table rows.
+    """
+
+    _attr_should_poll = False
+    _unsub_slot = None
+    _table_day = None
+    _slot_minutes = 60
+    _last_written: Optional[tuple] = None
+    _debouncer: Optional[RefreshDebouncer] = None
+    _next_state_table: Optional[list[Any]] = None
+    # Attributes holding {"today": [...], "tomorrow": [...]} tables
+    _day_table_attrs: tuple[str, ...] = ()
+    _entry: ConfigEntry
+    _state_table: list[Any]
+    _attrs: dict[str, Any]
+    _fingerprint: Optional[int]
+
+    @property
+    def extra_restore_state_data(self) -> Optional[_TableExtraData]:
+        if self._table_day is None:
+            return None
+        return _TableExtraData(
+            day=self._table_day.isoformat(),
+            slot_minutes=self._slot_minutes,
+            table=self._state_table,
+            attrs=self._attrs,
+            fingerprint=self._fingerprint,
+            config_hash=_config_hash(self._entry.options or self._entry.data),
+            next_table=self._next_state_table,
+        )
+
+    async def _async_restore_table(self) -> bool:
+        """Serve the stored table if it is for today and the current config."""
+        extra = await self.async_get_last_extra_data()
+        stored = _TableExtraData.from_dict(extra.as_dict()) if extra else None
+        if stored is None:
+            return False
+        cfg = self._entry.options or self._entry.data
+        now = dt_util.now()
+        if (
+            stored.day != now.date().isoformat()
+            or stored.config_hash != _config_hash(cfg)
+            or stored.slot_minutes != _slot_minutes(cfg)
+        ):
+            return False
+        self._state_table = stored.table
+        self._next_state_table = stored.next_table
+        self._attrs = stored.attrs
+        self._fingerprint = stored.fingerprint
+        self._slot_minutes = stored.slot_minutes
+        self._table_day = date.fromisoformat(stored.day)
+        self._select_slot(_slot_index(now, stored.slot_minutes))
+        return True
+
+    @abstractmethod
+    def _select_slot(self, index: int) -> None:
+        """Set the state from the cached table for slot `index`."""
+
+    def _next_wakeup(self, now: datetime) -> datetime:
+        """Point in time (UTC) for the timer after `now`: the next slot boundary."""
+        return _next_slot_start(now, self._slot_minutes)
+
+    def _arm_slot_timer(self) -> None:
+        self._cancel_slot_timer()
+        self._unsub_slot = async_track_point_in_utc_time(
+            self.hass, self._async_slot_boundary, self._next_wakeup(dt_util.utcnow())
+        )
+
+    def _cancel_slot_timer(self) -> None:
+        if self._unsub_slot:
+            self._unsub_slot()
+            self._unsub_slot = None
+
+    @callback
+    def _async_slot_boundary(self, point: datetime) -> None:
+        self._unsub_slot = None
+        local = dt_util.as_local(point)
+        if self._table_day is None:
+            # Nothing computed yet; the first computation is event driven
+            pass
+        elif self._table_day == local.date():
+            self._select_slot(_slot_index(local, self._slot_minutes))
+            self._async_write_if_changed()
+        elif self._async_promote(local):
+            self._async_write_if_changed()
+        else:
+            # Cached table belongs to another day; run the full update
+            self._async_schedule_refresh()
+        self._arm_slot_timer()
+
+    @callback
+    def _async_promote(self, now: datetime) -> bool:
+        """Make yesterday's "tomorrow" table today's; False if there is none."""
+        start_today = dt_util.start_of_local_day(now)
+        if (
+            not self._next_state_table
+            or self._table_day is None
+            or self._table_day + timedelta(days=1) != start_today.date()
+        ):
+            return False
+        self._state_table = self._next_state_table
+        self._next_state_table = None
+        self._table_day = start_today.date()
+        self._attrs = self._promoted_attrs(start_today)
+        self._select_slot(_slot_index(now, self._slot_minutes))
+        return True
+
+    def _promoted_attrs(self, start_today: datetime) -> dict[str, Any]:
+        """Attributes with the tomorrow tables moved to today (new dict, see `_async_write_if_changed`)."""
+        attrs = dict(self._attrs)
+        for key in self._day_table_attrs:
+            if key in attrs:
+                attrs[key] = {"today": attrs[key].get("tomorrow") or [], "tomorrow": []}
+        if "start" in attrs:
+            attrs["start"] = {
+                "today": start_today.isoformat(),
+                "tomorrow": (start_today + timedelta(days=1)).isoformat(),
+            }
+        return attrs
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state unless state, name, unit and attributes equal the last write."""
+        # Attribute dicts are replaced (never mutated) on recompute, so an
+        # unchanged table compares by identity before falling back to equality
+        current = (self.native_value, self._attr_name, self.native_unit_of_measurement, self.extra_state_attributes)
+        last = self._last_written
+        if last is not None and current[:3] == last[:3] and (current[3] is last[3] or current[3] == last[3]):
+            return
+        self._last_written = current
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_refresh(self) -> None:
+        """Run the full update in the background and write state if it changed."""
+        if self._debouncer is None:
+            cooldown = _update_debounce(self._entry.options or self._entry.data)
+            self._debouncer = RefreshDebouncer(self.hass, cooldown, self._async_refresh)
+        self._debouncer.async_schedule_call()
+
+    def _cancel_refresh(self) -> None:
+        if self._debouncer:
+            self._debouncer.async_shutdown()
+            self._debouncer = None
+
+    @callback
+    def _async_config_changed(self, changed: set[str]) -> None:
+        """Apply changed options (`changed` keys) without reloading the entry."""
+        if CONF_UPDATE_DEBOUNCE in changed and self._debouncer:
+            self._debouncer.cooldown = _update_debounce(self._entry.options or self._entry.data)
+
+    async def _async_refresh(self) -> None:
+        await self.async_update()
+        if self._unsub_slot:
+            # The resolution (slot length) may have changed with the tables
+            self._arm_slot_timer()
+        self._async_write_if_changed()
 
 
 # ---------------------------
@@ -179,12 +429,13 @@ class _LevelCfg:
 # ---------------------------
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
+    # No update before add: the first computation runs in the background once
+    # the Nordpool entity exists (see `PowerPriceSensor.async_added_to_hass`)
     async_add_entities(
         [
             PowerPriceSensor(hass, entry),
             PowerPriceLevelSensor(hass, entry),
-        ],
-        update_before_add=True,
+        ]
     )
 
 
@@ -192,10 +443,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 # Sensor 1: Power Price (UNIT/kWh)
 # ---------------------------
 
-class PowerPriceSensor(SensorEntity):
+class PowerPriceSensor(_SlotTableSensor):
     _attr_icon = "mdi:cash-clock"
     _attr_native_unit_of_measurement = None
     _attr_state_class = SensorStateClass.TOTAL
+    # Day tables stay on the state object but are kept out of the recorder
+    _unrecorded_attributes = frozenset({"prices", "raw_today", "raw_tomorrow"})
+    _day_table_attrs = ("prices",)
+    _window_attrs = ("cheapest_windows", "most_expensive_windows")
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.hass = hass
@@ -210,6 +465,12 @@ class PowerPriceSensor(SensorEntity):
 
         self._native_value: Optional[float] = None
         self._attrs: dict[str, Any] = {}
+        # Per-slot state values for `_table_day`, re-indexed at each slot boundary
+        self._state_table: list[Optional[float]] = []
+        # Contiguous window tables (hours -> table) over today+tomorrow, built
+        # once per `prices` attribute (identity) and looked up per slot
+        self._windows: dict[int, WindowTable] = {}
+        self._windows_prices: Optional[dict[str, Any]] = None
 
         # Read configuration from options if present, otherwise fall back to entry.data
         cfg_init = entry.options or entry.data
@@ -220,8 +481,21 @@ class PowerPriceSensor(SensorEntity):
             additional_ore=float(cfg_init.get(CONF_ADDITIONAL, entry.data.get(CONF_ADDITIONAL, 0.0))),
         )
 
+        # Nordpool data is parsed once per change and shared by all entries using it
+        self._source = async_get_source(hass, self._cfg.nordpool)
+        # Fingerprint of the inputs behind the current tables (see `_input_fingerprint`)
+        self._fingerprint: Optional[int] = None
+        # Fingerprints of tomorrow's spot prices behind `_next_state_table`, and
+        # of the promoted table once it is today's (see `_async_confirm_promoted`)
+        self._tomorrow_spot: Optional[int] = None
+        self._promoted_spot: Optional[int] = None
+        # Price tables are handed to the level sensor of this entry in memory
+        self._runtime = async_get_runtime(hass, entry)
+
         self._unsub = None
-        
+        # Pending start listener / timeout while waiting for the Nordpool entity
+        self._unsub_started = None
+        self._unsub_wait = None
 
     @property
     def native_value(self) -> Optional[float]:
@@ -232,28 +506,155 @@ class PowerPriceSensor(SensorEntity):
         return self._attrs
 
     async def async_added_to_hass(self) -> None:
-        # Recompute whenever Nordpool updates
-        @callback
-        def _changed(_event) -> None:
-            self.async_schedule_update_ha_state(True)
+        if await self._async_restore_table():
+            self._async_publish()
 
-        self._unsub = async_track_state_change_event(self.hass, [self._cfg.nordpool], _changed)
+        # Recompute whenever Nordpool prices change
+        self._unsub = self._source.async_add_listener(self._async_source_changed)
+        self.async_on_remove(self._runtime.async_add_config_listener(self._async_config_changed))
+        self._arm_slot_timer()
 
         # ensure unit is set immediately according to current config/options
         cfg = self._entry.options or self._entry.data
         currency = str(cfg.get(CONF_CURRENCY, self._entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)))
         self._attr_native_unit_of_measurement = _CURRENCY_UNIT_MAP.get(currency, "subunit/kWh")
         # write initial state to update unit in frontend
-        self.async_write_ha_state()
+        self._async_write_if_changed()
+
+        if self._source.available:
+            # Keeps a restored table when Nordpool still has the same prices
+            self._async_source_changed()
+        else:
+            # The source listener computes as soon as Nordpool shows up. If it
+            # is still missing SOURCE_WAIT_TIMEOUT seconds after Home Assistant
+            # has started, compute anyway (empty tables) and keep listening.
+            self._unsub_started = async_at_started(self.hass, self._async_start_wait)
+
+    @callback
+    def _async_source_changed(self) -> None:
+        self._cancel_wait()
+        if self._input_fingerprint() == self._fingerprint or self._async_confirm_promoted():
+            return
+        self._async_schedule_refresh()
+
+    @callback
+    def _async_confirm_promoted(self) -> bool:
+        """Keep the promoted tables if Nordpool has rolled their day into "today".
+
+        Only the first source change after midnight is checked, and only
+        while Nordpool has no tomorrow yet; anything else recomputes.
+        """
+        expected, self._promoted_spot = self._promoted_spot, None
+        if expected is None or self._table_day != dt_util.now().date():
+            return False
+        today_spot, tomorrow_spot = self._source.spot(self._slot_minutes)
+        if tomorrow_spot or fingerprint(today_spot) != expected:
+            return False
+        self._fingerprint = self._input_fingerprint()
+        return True
+
+    @callback
+    def _async_config_changed(self, changed: set[str]) -> None:
+        super()._async_config_changed(changed)
+        cfg = self._entry.options or self._entry.data
+        if CONF_NORDPOOL_ENTITY in changed:
+            # Move over to the shared source of the new Nordpool entity
+            if self._unsub:
+                self._unsub()
+            self._source = async_get_source(self.hass, cfg.get(CONF_NORDPOOL_ENTITY, self._entry.data.get(CONF_NORDPOOL_ENTITY)))
+            self._unsub = self._source.async_add_listener(self._async_source_changed)
+        if changed & _PRICE_OPTIONS:
+            # Name, unit and windows are refreshed by the update as well
+            self._async_schedule_refresh()
+            return
+        if CONF_SENSOR_NAME in changed:
+            self._attr_name = str(cfg.get(CONF_SENSOR_NAME, DEFAULT_NAME))
+        if CONF_WINDOW_HOURS in changed:
+            # Rebuilt from the current tables on the next slot selection
+            self._windows_prices = None
+            if self._table_day == dt_util.now().date():
+                self._select_slot(_slot_index(dt_util.now(), self._slot_minutes))
+        self._async_write_if_changed()
+
+    def _cancel_wait(self) -> None:
+        if self._unsub_started:
+            self._unsub_started()
+            self._unsub_started = None
+        if self._unsub_wait:
+            self._unsub_wait()
+            self._unsub_wait = None
+
+    @callback
+    def _async_start_wait(self, _hass: HomeAssistant) -> None:
+        if self._table_day is None and not self._unsub_wait:
+            self._unsub_wait = async_call_later(self.hass, SOURCE_WAIT_TIMEOUT, self._async_wait_expired)
+
+    @callback
+    def _async_wait_expired(self, _now: datetime) -> None:
+        self._unsub_wait = None
+        if self._table_day is None:
+            self._async_schedule_refresh()
 
     async def async_will_remove_from_hass(self) -> None:
+        self._cancel_slot_timer()
+        self._cancel_refresh()
+        self._cancel_wait()
         if self._unsub:
             self._unsub()
             self._unsub = None
 
+    def _select_slot(self, index: int) -> None:
+        self._native_value = self._state_table[index] if index < len(self._state_table) else None
+
+        prices = self._attrs.get("prices")
+        if prices is not self._windows_prices:
+            self._windows_prices = prices
+            self._windows = self._window_tables(prices or {})
+        attrs = self._window_slot_attrs(index) if self._windows else {}
+        if any(self._attrs.get(key) != attrs.get(key) for key in self._window_attrs):
+            self._attrs = {
+                **{key: value for key, value in self._attrs.items() if key not in self._window_attrs},
+                **attrs,
+            }
+
+    def _window_tables(self, prices: dict[str, Any]) -> dict[int, WindowTable]:
+        """Window tables for the configured lengths over today and tomorrow joined."""
+        joined = list(prices.get("today") or []) + list(prices.get("tomorrow") or [])
+        slots_per_hour = 60 // self._slot_minutes
+        return {
+            hours: window_table(joined, hours * slots_per_hour)
+            for hours in _window_hours(self._entry.options or self._entry.data)
+        }
+
+    def _window_slot_attrs(self, index: int) -> dict[str, Any]:
+        """Cheapest and most expensive window per length starting at slot `index` or later."""
+        start = dt_util.as_utc(dt_util.start_of_local_day(self._table_day))
+        step = timedelta(minutes=self._slot_minutes)
+
+        def _window(table: WindowTable, best: list[Optional[int]]) -> Optional[dict[str, Any]]:
+            first = best[index] if index < len(best) else None
+            if first is None:
+                return None
+            return {
+                "start": dt_util.as_local(start + step * first).isoformat(),
+                "end": dt_util.as_local(start + step * (first + table.length)).isoformat(),
+                "average": table.average(first),
+            }
+
+        return {
+            "cheapest_windows": {f"{hours}h": _window(table, table.cheapest) for hours, table in self._windows.items()},
+            "most_expensive_windows": {f"{hours}h": _window(table, table.most_expensive) for hours, table in self._windows.items()},
+        }
+
+    def _input_fingerprint(self) -> int:
+        """Fingerprint of the Nordpool arrays, price options and day the tables depend on."""
+        cfg = self._entry.options or self._entry.data
+        return fingerprint(self._source.fingerprint, {key: cfg.get(key) for key in _PRICE_OPTIONS}, dt_util.now().date())
+
     async def async_update(self) -> None:
         # Options override data for prices/adders
         cfg = self._entry.options or self._entry.data
+        self._fingerprint = self._input_fingerprint()
 
         # Update name if user changed it in options
         self._attr_name = str(cfg.get(CONF_SENSOR_NAME, DEFAULT_NAME))
@@ -262,78 +663,43 @@ class PowerPriceSensor(SensorEntity):
         currency = str(cfg.get(CONF_CURRENCY, self._entry.data.get(CONF_CURRENCY, "NOK")))
         self._attr_native_unit_of_measurement = _CURRENCY_UNIT_MAP.get(currency, "subunit/kWh")
 
-        nordpool_entity_id = self._cfg.nordpool
-        nordpool_state = self.hass.states.get(nordpool_entity_id)
-        nord_attrs = (nordpool_state.attributes if nordpool_state else {}) or {}
-
-        today_q = nord_attrs.get("today") or []
-        tomorrow_q = nord_attrs.get("tomorrow") or []
-
-        hour = dt_util.now().hour
-
-        # Read configured grid/additional values (expected as major currency units, e.g. NOK/kWh)
-        grid_day = round(float(cfg.get(CONF_GRID_DAY, self._cfg.grid_day_ore)), 4)
-        grid_night = round(float(cfg.get(CONF_GRID_NIGHT, self._cfg.grid_night_ore)), 4)
-        additional = round(float(cfg.get(CONF_ADDITIONAL, self._cfg.additional_ore)), 4)
-
-        # Build hourly prices and apply grid/day or grid/night adders using the
-        # grid-specific night window (`CONF_GRID_NIGHT_START/END`). The current
-        # state (`native_value`) must reflect spot + appropriate grid adder for
-        # the current hour.
-        today_hourly = _quarterhour_to_hourly(today_q)
-        if today_hourly:
-            idx = hour % len(today_hourly)
-            spot = today_hourly[idx]
-            # determine grid night window for adders
-            grid_nighthourstart = int(cfg.get(CONF_GRID_NIGHT_START, DEFAULT_GRID_NIGHT_START))
-            grid_nighthourend = int(cfg.get(CONF_GRID_NIGHT_END, DEFAULT_GRID_NIGHT_END))
-            if spot is None:
-                self._native_value = None
-            else:
-                # support wrapping night window
-                if grid_nighthourstart < grid_nighthourend:
-                    is_night = grid_nighthourstart <= hour < grid_nighthourend
-                else:
-                    is_night = hour >= grid_nighthourstart or hour < grid_nighthourend
-                add_for_hour = grid_night if is_night else grid_day
-                self._native_value = round(float(spot) + add_for_hour + additional, 4)
-        else:
-            self._native_value = None
-
-        dst_today_23 = len(today_hourly) == 23
-        # Use the grid-specific night window when building the `prices` arrays so
-        # the displayed per-hour prices include the correct grid adders.
-        grid_nighthourstart = int(cfg.get(CONF_GRID_NIGHT_START, DEFAULT_GRID_NIGHT_START))
-        grid_nighthourend = int(cfg.get(CONF_GRID_NIGHT_END, DEFAULT_GRID_NIGHT_END))
-        prices_today = _build_24_prices(today_hourly, grid_day, grid_night, grid_nighthourstart, grid_nighthourend, dst_today_23, additional)
+        now = dt_util.now()
+        start_today = dt_util.start_of_local_day(now)
+        start_tomorrow = start_today + timedelta(days=1)
+        slot_minutes = _slot_minutes(cfg)
+        compact = _is_compact(cfg)
+
+        # Configured grid/additional values (major currency units, e.g. NOK/kWh)
+        # and the grid night window for the adders
+        pcfg = price_config(cfg, self._entry.data)
+
+        # One slot per real hour or Nordpool MTU from local midnight
+        # (23/24/25 hours or 92/96/100 quarter-hours); the grid night window
+        # picks the day/night adder by each slot's local hour.
+        today_spot, tomorrow_spot = self._source.spot(slot_minutes)
+        today_starts = slot_starts(start_today, len(today_spot), slot_minutes)
+        today_hours = [t.hour for t in today_starts]
+        self._state_table = state_table(today_spot, pcfg, today_hours)
+        prices_today = price_table(today_spot, pcfg, today_hours)
 
         prices_tomorrow: list[Optional[float]] = []
-        if tomorrow_q:
-            tomorrow_hourly = _quarterhour_to_hourly(tomorrow_q)
-            dst_tomorrow_23 = len(tomorrow_hourly) == 23
-            prices_tomorrow = _build_24_prices(tomorrow_hourly, grid_day, grid_night, grid_nighthourstart, grid_nighthourend, dst_tomorrow_23, additional)
+        tomorrow_starts: list[datetime] = []
+        self._next_state_table = None
+        self._tomorrow_spot = fingerprint(tomorrow_spot) if tomorrow_spot else None
+        self._promoted_spot = None
+        if tomorrow_spot:
+            tomorrow_starts = slot_starts(start_tomorrow, len(tomorrow_spot), slot_minutes)
+            tomorrow_hours = [t.hour for t in tomorrow_starts]
+            prices_tomorrow = price_table(tomorrow_spot, pcfg, tomorrow_hours)
+            self._next_state_table = state_table(tomorrow_spot, pcfg, tomorrow_hours)
 
         # ---- raw_today / raw_tomorrow (Nordpool-like) ----
-        start_today = dt_util.start_of_local_day(dt_util.now())
-        start_tomorrow = start_today + timedelta(days=1)
+        if not compact:
+            raw_today = _raw_slots(today_starts, prices_today, slot_minutes)
+            raw_tomorrow = _raw_slots(tomorrow_starts, prices_tomorrow, slot_minutes)
 
-        raw_today = [
-            {
-                "start": (start_today + timedelta(hours=i)).isoformat(),
-                "end": (start_today + timedelta(hours=i + 1)).isoformat(),
-                "value": float(prices_today[i] or 0.0),
-            }
-            for i in range(len(prices_today))
-        ]
-
-        raw_tomorrow = [
-            {
-                "start": (start_tomorrow + timedelta(hours=i)).isoformat(),
-                "end": (start_tomorrow + timedelta(hours=i + 1)).isoformat(),
-                "value": float(prices_tomorrow[i] or 0.0),
-            }
-            for i in range(len(prices_tomorrow))
-        ]
+        self._slot_minutes = slot_minutes
+        self._table_day = start_today.date()
 
         self._attrs = {
             "config": {
@@ -342,19 +708,65 @@ class PowerPriceSensor(SensorEntity):
                 "grid_night_start": int(cfg.get(CONF_GRID_NIGHT_START, DEFAULT_GRID_NIGHT_START)),
                 "grid_night_end": int(cfg.get(CONF_GRID_NIGHT_END, DEFAULT_GRID_NIGHT_END)),
                 "additional": float(cfg.get(CONF_ADDITIONAL, 0.0)),
+                "resolution": str(cfg.get(CONF_RESOLUTION, DEFAULT_RESOLUTION)),
             },
             "prices": {"today": prices_today, "tomorrow": prices_tomorrow},
-            "raw_today": raw_today,
-            "raw_tomorrow": raw_tomorrow,
         }
+        if compact:
+            # Columnar series: slot i of a day starts at start + i * slot_minutes
+            self._attrs["start"] = {"today": start_today.isoformat(), "tomorrow": start_tomorrow.isoformat()}
+            self._attrs["slot_minutes"] = slot_minutes
+        else:
+            self._attrs["raw_today"] = raw_today
+            self._attrs["raw_tomorrow"] = raw_tomorrow
+
+        self._select_slot(_slot_index(now, slot_minutes))
+        self._async_publish()
+
+    @callback
+    def _async_promote(self, now: datetime) -> bool:
+        if not super()._async_promote(now):
+            return False
+        # Nordpool may still hold yesterday as "today"; the promoted tables
+        # stand until its prices next change and are checked against them then
+        self._fingerprint = self._input_fingerprint()
+        self._promoted_spot, self._tomorrow_spot = self._tomorrow_spot, None
+        self._async_publish(promoted=True)
+        return True
+
+    def _promoted_attrs(self, start_today: datetime) -> dict[str, Any]:
+        attrs = super()._promoted_attrs(start_today)
+        if "raw_tomorrow" in attrs:
+            attrs["raw_today"] = attrs["raw_tomorrow"]
+            attrs["raw_tomorrow"] = []
+        return attrs
+
+    @callback
+    def _async_publish(self, promoted: bool = False) -> None:
+        """Hand the current tables to the level sensor of this entry."""
+        prices = self._attrs.get("prices") or {}
+        self._runtime.async_publish_price(
+            PriceResult(
+                today=prices.get("today") or [],
+                tomorrow=prices.get("tomorrow") or [],
+                slot_minutes=self._slot_minutes,
+                day=self._table_day,
+                fingerprint=self._fingerprint,
+                promoted=promoted,
+            )
+        )
 
 
 # ---------------------------
 # Sensor 2: Power Price Level (full rule set, configured in wizard)
 # ---------------------------
 
-class PowerPriceLevelSensor(SensorEntity):
+class PowerPriceLevelSensor(_SlotTableSensor):
     _attr_icon = "mdi:cash-multiple"
+    # Day tables stay on the state object but are kept out of the recorder
+    _unrecorded_attributes = frozenset({"prices", "en_prices", "levels", "next_start", "remaining"})
+    _day_table_attrs = ("prices", "en_prices", "levels")
+    _timeline_attrs = ("next_change", "next_level", "next_start", "remaining")
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.hass = hass
@@ -368,8 +780,22 @@ class PowerPriceLevelSensor(SensorEntity):
 
         self._state: Optional[str] = None
         self._attrs: dict[str, Any] = {}
+        self._fingerprint: Optional[int] = None
+        # Level keys for `_table_day`, re-indexed at each slot boundary
+        self._state_table: list[str] = []
         self._labels: dict[str, str] = {}
         self._labels_lang: str | None = None
+        self._en_labels: dict[str, str] = {}
+        # Rolling ranking over today+tomorrow (None when ranking per day);
+        # today's slots come first in it
+        self._horizon: Optional[HorizonRanking] = None
+        self._horizon_today = 0
+        # Level key of the current slot and the transition event waiting for
+        # the state write
+        self._current_key: Optional[str] = None
+        self._pending_transition: Optional[dict[str, Any]] = None
+        # Slot of `_table_day` the state shows (handed to the binary sensors)
+        self._slot = 0
 
         # Auto-discover the PowerPriceSensor from the same entry via entity registry unique_id
         self._power_price_unique_id = f"{entry.entry_id}_power_price"
@@ -377,6 +803,12 @@ class PowerPriceLevelSensor(SensorEntity):
         cfg_init = entry.options or entry.data
         self._power_price_entity_id: Optional[str] = str(cfg_init.get(CONF_POWERPRICE_ENTITY, entry.data.get(CONF_POWERPRICE_ENTITY, None))) if cfg_init.get(CONF_POWERPRICE_ENTITY, entry.data.get(CONF_POWERPRICE_ENTITY, None)) else None
 
+        # Prices of this entry's own PowerPriceSensor arrive in memory through
+        # the runtime; only an external price entity is read from the state machine
+        self._runtime = async_get_runtime(hass, entry)
+        own = self._own_power_price_entity_id()
+        self._external = bool(self._power_price_entity_id) and self._power_price_entity_id != own
+
         self._unsub = None
 
     @property
@@ -387,261 +819,249 @@ class PowerPriceLevelSensor(SensorEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         return self._attrs
 
-    def _resolve_power_price_entity_id(self) -> Optional[str]:
-        ent_reg = er.async_get(self.hass)
-
-        entity_id = ent_reg.async_get_entity_id(
-            "sensor",
-            "power_price_level",  # integration domain
-            self._power_price_unique_id,
-        )
-        if entity_id:
-            return entity_id
-
-        # Fallback if user didn't rename and registry lookup fails
-        if self.hass.states.get("sensor.power_price"):
-            return "sensor.power_price"
-
-        return None
+    def _own_power_price_entity_id(self) -> Optional[str]:
+        """Entity id of this entry's PowerPriceSensor (registry lookup by unique_id)."""
+        return er.async_get(self.hass).async_get_entity_id("sensor", DOMAIN, self._power_price_unique_id)
 
     async def async_added_to_hass(self) -> None:
-        # If user hasn't selected a custom power price entity, try to resolve the integration-created one
-        if not self._power_price_entity_id:
-            self._power_price_entity_id = self._resolve_power_price_entity_id()
+        if not self._external:
+            # Reported as `source_entity`; the tables themselves come from the runtime
+            self._power_price_entity_id = self._own_power_price_entity_id()
+
+        # Labels first: a restored table is shown through them right away
+        await self._async_load_labels(self._entry.options or self._entry.data)
+        if await self._async_restore_table():
+            if "levels" not in self._attrs or _is_rolling(self._entry.options or self._entry.data):
+                # Stored before the level keys were published, or the rolling
+                # ranking (not stored) is needed; rebuild on the next input
+                self._fingerprint = None
+            elif "prices" in self._attrs:
+                # The language may have changed since the table was stored
+                self._attrs = {**self._attrs, **self._level_table_attrs(True)}
+
+        self._async_subscribe()
+        self.async_on_remove(self._runtime.async_add_config_listener(self._async_config_changed))
+        self._arm_slot_timer()
+        self._async_publish_levels()
+
+    @callback
+    def _async_subscribe(self) -> None:
+        if self._external:
+            # Track the external price entity so level updates when prices change
+            self._unsub = async_track_state_change_event(self.hass, [self._power_price_entity_id], self._async_price_state_changed)
+            state = self.hass.states.get(self._power_price_entity_id)
+            if state and (self._fingerprint is None or self._input_fingerprint(state.attributes.get("prices")) != self._fingerprint):
+                self._async_schedule_refresh()
+        else:
+            self._unsub = self._runtime.async_add_listener(self._async_price_published)
+            # Pick up a result the price sensor published before we were added
+            self._async_price_published()
+
+    @callback
+    def _async_price_published(self) -> None:
+        price = self._runtime.price
+        if price is None:
+            return
+        if price.promoted and (self._table_day == price.day or self._async_promote(dt_util.now())):
+            # Midnight: these levels were computed as "tomorrow" already
+            self._fingerprint = self._input_fingerprint(price.fingerprint)
+            self._async_write_if_changed()
+            return
+        if self._fingerprint is not None and self._input_fingerprint(price.fingerprint) == self._fingerprint:
+            return
+        self._async_schedule_refresh()
+
+    @callback
+    def _async_price_state_changed(self, event) -> None:
+        # The price sensor writes its state at every slot boundary; only
+        # recompute levels when the price tables themselves changed.
+        new_state = event.data.get("new_state")
+        prices = new_state.attributes.get("prices") if new_state else None
+        if self._fingerprint is not None and self._input_fingerprint(prices) == self._fingerprint:
+            return
+        self._async_schedule_refresh()
 
-        @callback
-        def _changed(_event) -> None:
-            self.async_schedule_update_ha_state(True)
+    @callback
+    def _async_config_changed(self, changed: set[str]) -> None:
+        super()._async_config_changed(changed)
+        cfg = self._entry.options or self._entry.data
+        if CONF_SENSOR_NAME in changed:
+            self._attr_name = f"{cfg.get(CONF_SENSOR_NAME, self._entry.data.get(CONF_SENSOR_NAME, DEFAULT_NAME))} Level"
+        if CONF_POWERPRICE_ENTITY in changed:
+            if self._unsub:
+                self._unsub()
+                self._unsub = None
+            configured = cfg.get(CONF_POWERPRICE_ENTITY, self._entry.data.get(CONF_POWERPRICE_ENTITY))
+            own = self._own_power_price_entity_id()
+            self._external = bool(configured) and configured != own
+            self._power_price_entity_id = configured if self._external else own
+            self._fingerprint = None
+            self._async_subscribe()
+        elif changed & _LEVEL_OPTIONS and (self._external or not changed & _PRICE_OPTIONS):
+            # (with price changes too, the own price sensor's next publish triggers the update)
+            self._async_schedule_refresh()
+        elif CONF_LEVEL_LANGUAGE in changed:
+            self.hass.async_create_task(self._async_relabel())
+        else:
+            self._async_write_if_changed()
 
-        # Track the price sensor so level updates when prices change
-        if self._power_price_entity_id:
-            self._unsub = async_track_state_change_event(self.hass, [self._power_price_entity_id], _changed)
+    async def _async_relabel(self) -> None:
+        """Project the level keys through the labels of the new language (no re-ranking)."""
+        await self._async_load_labels(self._entry.options or self._entry.data)
+        if "prices" in self._attrs:
+            self._attrs = {**self._attrs, "prices": self._label_tables(self._labels or {})}
+        if self._table_day == dt_util.now().date():
+            self._select_slot(_slot_index(dt_util.now(), self._slot_minutes))
+        self._async_write_if_changed()
 
     async def async_will_remove_from_hass(self) -> None:
+        self._cancel_slot_timer()
+        self._cancel_refresh()
         if self._unsub:
             self._unsub()
             self._unsub = None
 
-    def _get_pricelevel(self, hour: int, day_prices: list[Optional[float]], cfg: dict[str, Any], labels_override: dict[str, str] | None = None) -> str:
-        # Wizard/Options values
-        cheap_price_ore = float(cfg.get(CONF_CHEAP_PRICE, 0.0))
-        nighthourend = int(cfg.get(CONF_NIGHT_HOUR_END, 0))
-        dayhourend = int(cfg.get(CONF_DAY_HOUR_END, 24))
-        cheaphours = int(cfg.get(CONF_CHEAP_HOURS, 0))
-        expensivehours = int(cfg.get(CONF_EXPENSIVE_HOURS, 0))
-        cheaphoursnight = int(cfg.get(CONF_CHEAP_HOURS_NIGHT, 0))
-        cheaphoursday = int(cfg.get(CONF_CHEAP_HOURS_DAY, 0))
-        cheaphoursevening = int(cfg.get(CONF_CHEAP_HOURS_EVENING, 0))
-
-        # Cheap price threshold (main currency unit)
-        cheapprice = cheap_price_ore
-
-        # For level/period calculations, night is defined to start at 0
-        # (00:00). The configured `CONF_NIGHT_HOUR_START` controls grid adders
-        # only; level periods use fixed start=0, end=`CONF_NIGHT_HOUR_END`.
-        nighthourstart = 0
-        eveninghourend = 24
-
-        # labels are loaded from translation files in `async_update`
-        # Do not fall back to built-in labels; require translations to provide them.
-        labels = labels_override or self._labels or {}
-
-        if not isinstance(day_prices, list) or len(day_prices) < 24:
-            return labels.get("unavailable")
-
-        p = day_prices[hour]
-        if p is None:
-            return labels.get("unavailable")
-        pricethishour = float(p)
-
-        # Match template: sort the full 0:24 list (including any None)
-        day24 = day_prices[:24]
-        day24_sorted = sorted(day24, key=lambda x: (x is None, x))  # None last
-        day24_sorted_desc = sorted(day24, key=lambda x: (x is None, x), reverse=True)  # None first in reverse
-
-        cheapesthour = day24_sorted[0]
-        mostexpensivehour = day24_sorted[23] if len(day24_sorted) >= 24 else None
-
-        vals_for_avg = [v for v in day24 if v is not None]
-        if not vals_for_avg:
-            return labels.get("unavailable")
-        averageprice = sum(vals_for_avg) / len(vals_for_avg)
-
-        # take the lowest `cheaphours` values (starting at index 0)
-        cheapesthours_str = "[ " + ", ".join(
-            str(day24_sorted[i]) for i in range(min(max(0, cheaphours), len(day24_sorted)))
-        ) + " ]"
-
-        # take the highest `expensivehours` values (starting at index 0 of the descending list)
-        mostexpensivehours_str = "[ " + ", ".join(
-            str(day24_sorted_desc[i]) for i in range(min(max(0, expensivehours), len(day24_sorted_desc)))
-        ) + " ]"
-
-        # Support night windows that wrap across midnight (e.g. 22 -> 06)
-        if nighthourstart < nighthourend:
-            night_slice = sorted(day24[nighthourstart:nighthourend], key=lambda x: (x is None, x))
-        else:
-            night_slice = sorted(day24[nighthourstart:] + day24[:nighthourend], key=lambda x: (x is None, x))
-        day_slice = sorted(day24[nighthourend:dayhourend], key=lambda x: (x is None, x))
-        eve_slice = sorted(day24[dayhourend:eveninghourend], key=lambda x: (x is None, x))
-
-        cheapesthournight_str = "[ " + ", ".join(
-            str(night_slice[i]) for i in range(max(0, cheaphoursnight))
-            if i < len(night_slice)
-        ) + " ]"
-
-        cheapesthourday_str = "[ " + ", ".join(
-            str(day_slice[i]) for i in range(max(0, cheaphoursday))
-            if i < len(day_slice)
-        ) + " ]"
-
-        cheapesthourevening_str = "[ " + ", ".join(
-            str(eve_slice[i]) for i in range(max(0, cheaphoursevening))
-            if i < len(eve_slice)
-        ) + " ]"
-
-        # Use stable keys for membership checks to avoid string-format mismatches
-        p_key = _k(pricethishour)
-
-        # exact cheapest / most expensive comparisons using keys
-        cheapest_key = _k(cheapesthour) if cheapesthour is not None else None
-        mostexpensive_key = _k(mostexpensivehour) if mostexpensivehour is not None else None
-
-        # Original decision order (template): cheap_price -> cheapest_hour ->
-        # cheapest_hours -> per-period cheapest -> most-expensive -> normal/expensive
-        if cheapprice > 0 and pricethishour <= cheapprice:
-            return labels.get("cheap")
-
-        if cheapest_key is not None and p_key == cheapest_key:
-            return labels.get("cheapest_hour")
-
-        # Build lists of keys for requested counts.
-        # Exclude the absolute cheapest/most-expensive so these grouped lists
-        # represent the next-N cheapest / most expensive hours (template semantics).
-        # absolute cheapest is at day24_sorted[0], absolute most-expensive is at
-        # day24_sorted_desc[0]. Start selection at index 1.
-        start_index_cheapest = 1 if len(day24_sorted) > 0 else 0
-        end_index_cheapest = min(start_index_cheapest + max(0, cheaphours), len(day24_sorted))
-        cheapest_keys = [ _k(day24_sorted[i]) for i in range(start_index_cheapest, end_index_cheapest) if day24_sorted[i] is not None ]
-
-        start_index_exp = 1 if len(day24_sorted_desc) > 0 else 0
-        end_index_exp = min(start_index_exp + max(0, expensivehours), len(day24_sorted_desc))
-        mostexpensive_keys = [ _k(day24_sorted_desc[i]) for i in range(start_index_exp, end_index_exp) if day24_sorted_desc[i] is not None ]
-
-        if p_key in cheapest_keys:
-            return labels.get("cheapest_hours")
-
-        # Per-period cheapest sets (for night/day/evening slices) — no supplementation
-        cheapest_night_keys = [ _k(night_slice[i]) for i in range(min(max(0, cheaphoursnight), len(night_slice))) if night_slice[i] is not None ]
-        cheapest_day_keys = [ _k(day_slice[i]) for i in range(min(max(0, cheaphoursday), len(day_slice))) if day_slice[i] is not None ]
-        cheapest_evening_keys = [ _k(eve_slice[i]) for i in range(min(max(0, cheaphoursevening), len(eve_slice))) if eve_slice[i] is not None ]
-
-        # Check per-period cheap_time
-        in_night = (nighthourstart < nighthourend and nighthourstart <= hour < nighthourend) or (
-            nighthourstart >= nighthourend and (hour >= nighthourstart or hour < nighthourend)
-        )
-        in_day = nighthourend <= hour < dayhourend
-        in_evening = dayhourend <= hour < eveninghourend
+    def _select_slot(self, index: int) -> None:
+        if self._horizon is not None:
+            self._rank_horizon(index)
+        key = self._state_table[index] if index < len(self._state_table) else "unavailable"
+        self._state = (self._labels or {}).get(key)
+        self._slot = index
+
+        attrs = self._timeline(index)
+        if any(self._attrs.get(name) != attrs.get(name) for name in self._timeline_attrs):
+            self._attrs = {**self._attrs, **attrs}
+        if key != self._current_key:
+            if self._current_key is not None:
+                self._pending_transition = {
+                    "entity_id": self.entity_id,
+                    "entry_id": self._entry.entry_id,
+                    "level": key,
+                    "previous_level": self._current_key,
+                    "next_change": attrs["next_change"],
+                    "next_level": attrs["next_level"],
+                }
+            self._current_key = key
+
+    def _timeline(self, index: int) -> dict[str, Any]:
+        """Next level change, minutes left of the current level and the next start of every level after slot `index`.
+
+        Runs over today's and tomorrow's tables joined (slot j starts
+        `j * slot_minutes` after local midnight of `_table_day`). `remaining`
+        counts from the start of slot `index`, so it steps down at each slot.
+        """
+        keys = self._state_table + (self._next_state_table or [])
+        start = dt_util.as_utc(dt_util.start_of_local_day(self._table_day))
+        step = timedelta(minutes=self._slot_minutes)
+        current = keys[index] if index < len(keys) else None
+        change = index + 1
+        while change < len(keys) and keys[change] == current:
+            change += 1
+        next_start: dict[str, str] = {}
+        for j in range(change, len(keys)):
+            if keys[j] not in next_start and keys[j] != "unavailable":
+                next_start[keys[j]] = dt_util.as_local(start + step * j).isoformat()
+        # Past the last known slot the next level is unknown
+        next_change = start + step * change if keys else None
+        return {
+            "next_change": dt_util.as_local(next_change).isoformat() if next_change else None,
+            "next_level": keys[change] if change < len(keys) else None,
+            "next_start": next_start,
+            "remaining": (change - index) * self._slot_minutes if keys else None,
+        }
 
-        if (
-            (p_key in cheapest_day_keys and in_day)
-            or (p_key in cheapest_night_keys and in_night)
-            or (p_key in cheapest_evening_keys and in_evening)
-        ):
-            return labels.get("cheap_time")
-
-        # If this hour is one of the most expensive, prefer that label now
-        if mostexpensive_key is not None and p_key == mostexpensive_key:
-            return labels.get("most_expensive_hour")
-        if p_key in mostexpensive_keys:
-            return labels.get("most_expensive_hours")
-        if pricethishour <= averageprice:
-            return labels.get("normal")
-        if pricethishour > averageprice:
-            return labels.get("expensive")
-        return labels.get("unavailable")
+    @callback
+    def _async_write_if_changed(self) -> None:
+        super()._async_write_if_changed()
+        self._async_publish_levels()
+        # Fired after the new state is written, so listeners read it
+        if self._pending_transition is not None:
+            event_data, self._pending_transition = self._pending_transition, None
+            self.hass.bus.async_fire(EVENT_LEVEL_TRANSITION, event_data)
+
+    @callback
+    def _async_publish_levels(self) -> None:
+        """Hand the level keys and current slot to the entry's binary sensors (see `binary_sensor.py`)."""
+        if self._table_day is None:
+            return
+        self._runtime.async_publish_levels(
+            LevelResult(
+                today=self._state_table,
+                tomorrow=self._next_state_table or [],
+                slot_minutes=self._slot_minutes,
+                day=self._table_day,
+                index=self._slot,
+            )
+        )
 
-    async def async_update(self) -> None:
-        # Options override data
+    def _rank_horizon(self, index: int) -> None:
+        """Re-rank the slots from `index` on; earlier slots keep the level they had."""
+        split = self._horizon_today
+        if index >= split:
+            return
+        keys = self._horizon.levels(index)
+        past = self._state_table[:index]
+        today = past + ["unavailable"] * (index - len(past)) + keys[: split - index]
+        tomorrow = keys[split - index:]
+        if today == self._state_table and tomorrow == (self._next_state_table or []):
+            return
+        self._state_table = today
+        self._next_state_table = tomorrow or None
+        self._attrs = {**self._attrs, **self._level_table_attrs("prices" in self._attrs)}
+
+    @callback
+    def _async_promote(self, now: datetime) -> bool:
+        # The rolling ranking changes with the horizon; recompute instead
+        if self._horizon is not None:
+            return False
+        return super()._async_promote(now)
+
+    def _input_fingerprint(self, prices: Any) -> int:
+        """Fingerprint of the price tables (or their fingerprint), level options and day the levels depend on."""
         cfg = self._entry.options or self._entry.data
+        return fingerprint(prices, {key: cfg.get(key) for key in _LEVEL_OPTIONS}, dt_util.now().date())
 
-        # Load localized labels from translation files (with English fallback)
+    async def _async_load_labels(self, cfg: Any) -> None:
+        """Load localized labels from translation files (with English fallback)."""
         sel = str(cfg.get(CONF_LEVEL_LANGUAGE, DEFAULT_LEVEL_LANGUAGE))
         if sel in LANGUAGE_DISPLAY_MAP:
             lang = LANGUAGE_DISPLAY_MAP.get(sel, DEFAULT_LEVEL_LANGUAGE)
         else:
             lang = sel
 
-        # Only reload translations when the requested language changes
+        # Only look up labels when the requested language changes; the files
+        # themselves are parsed once and shared through `labels.py`
         if self._labels_lang != lang:
-            labels = {}
-            try:
-                # Prefer reading local translation files directly (robust at startup)
-                from pathlib import Path
-                import json
-
-                translations_dir = Path(__file__).resolve().parent / "translations"
-
-                # Build candidate language codes
-                candidates = []
-                if lang:
-                    candidates.append(lang)
-                    if "-" in lang:
-                        candidates.append(lang.split("-", 1)[0])
-                    if "_" in lang:
-                        candidates.append(lang.split("_", 1)[0])
-                candidates.append("en")
-
-                tried = []
-                for cand in [] if candidates is None else candidates:
-                    if not cand:
-                        continue
-                    cand = cand.lower()
-                    if cand in tried:
-                        continue
-                    tried.append(cand)
-                    p = translations_dir / f"{cand}.json"
-                    if p.exists():
-                        try:
-                            def _read_json(path):
-                                with path.open("r", encoding="utf-8") as fh:
-                                    return json.load(fh)
-
-                            translations = await self.hass.async_add_executor_job(_read_json, p)
-                            labels = translations.get("sensor", {}).get("power_price_level", {}).get("state", {}) or {}
-                            if labels:
-                                break
-                        except Exception:
-                            pass
-
-                # Fallback to HA helper if nothing loaded from files
-                if not labels:
-                    try:
-                        translations = await translation_helper.async_get_translations(self.hass, DOMAIN, lang)
-                        labels = translations.get("sensor", {}).get("power_price_level", {}).get("state", {}) or {}
-                        if not labels:
-                            en_trans = await translation_helper.async_get_translations(self.hass, DOMAIN, "en")
-                            labels = en_trans.get("sensor", {}).get("power_price_level", {}).get("state", {}) or {}
-                    except Exception:
-                        labels = {}
-
-            except Exception:
-                labels = {}
+            labels = await async_get_level_labels(self.hass, lang)
 
             # Only cache when we actually found translations so we retry later if not
             if labels:
                 self._labels = labels
                 self._labels_lang = lang
+        if not self._en_labels:
+            self._en_labels = await async_get_level_labels(self.hass, "en")
 
-        if not self._power_price_entity_id:
-            self._power_price_entity_id = self._resolve_power_price_entity_id()
-
-        if not self._power_price_entity_id:
-            self._state = (self._labels or {}).get("unavailable")
-            self._attrs = {
-                "debug_source": "custom_components.power_price_level",
-                "reason": "no_power_price_entity",
-            }
+    async def async_update(self) -> None:
+        # Options override data
+        cfg = self._entry.options or self._entry.data
+        await self._async_load_labels(cfg)
+
+        if not self._external:
+            price = self._runtime.price
+            if price is None:
+                self._state = (self._labels or {}).get("unavailable")
+                self._attrs = {
+                    "debug_source": "custom_components.power_price_level",
+                    "reason": "power_price_missing",
+                }
+                self._state_table = []
+                self._fingerprint = None
+                return
+            if price.day != dt_util.now().date():
+                # Midnight: keep the current table until the price sensor publishes the new day
+                return
+            self._fingerprint = self._input_fingerprint(price.fingerprint)
+            self._compute_levels(cfg, price.today, price.tomorrow)
             return
 
         power_price_state = self.hass.states.get(self._power_price_entity_id)
@@ -651,6 +1071,8 @@ class PowerPriceLevelSensor(SensorEntity):
                 "debug_source": "custom_components.power_price_level",
                 "reason": "power_price_missing",
             }
+            self._state_table = []
+            self._fingerprint = None
             return
 
         powerprice = power_price_state.attributes.get("prices")
@@ -660,34 +1082,43 @@ class PowerPriceLevelSensor(SensorEntity):
                 "debug_source": "custom_components.power_price_level",
                 "reason": "no_prices_attribute",
             }
+            self._state_table = []
+            self._fingerprint = None
             return
 
-        today = powerprice.get("today") or []
-        tomorrow = powerprice.get("tomorrow") or []
-
-        hour = dt_util.now().hour
-
-        self._state = self._get_pricelevel(hour, today, cfg)
-        # Build English-only labels/prices by reading local translations/en.json only
-        en_labels: dict[str, str] = {}
-        try:
-            from pathlib import Path
-            import json
-
-            translations_dir = Path(__file__).resolve().parent / "translations"
-            p = translations_dir / "en.json"
-            if p.exists():
-                def _read_json(path):
-                    with path.open("r", encoding="utf-8") as fh:
-                        return json.load(fh)
-
-                translations = await self.hass.async_add_executor_job(_read_json, p)
-                en_labels = translations.get("sensor", {}).get("power_price_level", {}).get("state", {}) or {}
-        except Exception:
-            en_labels = {}
+        self._fingerprint = self._input_fingerprint(powerprice)
+        self._compute_levels(cfg, powerprice.get("today") or [], powerprice.get("tomorrow") or [])
+
+    def _compute_levels(self, cfg: Any, today: list[Any], tomorrow: list[Any]) -> None:
+        now = dt_util.now()
+        start_today = dt_util.start_of_local_day(now)
+        slot_minutes = _slot_minutes(cfg)
+
+        # Rank each day once over its real slots; both label tables are
+        # projected from the same keys
+        lcfg = level_config(cfg)
+        sph = 60 // slot_minutes
+        today_hours = slot_hours(start_today, len(today), slot_minutes)
+        tomorrow_hours = slot_hours(start_today + timedelta(days=1), len(tomorrow), slot_minutes) if tomorrow else []
+        self._horizon = None
+        if _is_rolling(cfg) and isinstance(today, list) and isinstance(tomorrow, list):
+            # One sort over the known horizon; the remaining slots are
+            # re-classified at each slot (see `_rank_horizon`) and slots
+            # already past start from the full ranking
+            self._horizon = HorizonRanking(today + tomorrow, lcfg, today_hours + tomorrow_hours, sph)
+            self._horizon_today = min(len(today), len(self._horizon))
+            levels = self._horizon.levels(0)
+            levels_today = levels[: self._horizon_today]
+            levels_tomorrow = levels[self._horizon_today:]
+        else:
+            levels_today = day_levels(today, lcfg, today_hours, sph)
+            levels_tomorrow = day_levels(tomorrow, lcfg, tomorrow_hours, sph) if tomorrow else []
 
-        en_prices_today = [self._get_pricelevel(h, today, cfg, labels_override=en_labels) for h in range(24)]
-        en_prices_tomorrow = [self._get_pricelevel(h, tomorrow, cfg, labels_override=en_labels) for h in range(24)] if tomorrow else []
+        self._state_table = levels_today
+        self._next_state_table = levels_tomorrow or None
+        self._slot_minutes = slot_minutes
+        self._table_day = start_today.date()
+        self._state = None
 
         self._attrs = {
             "source_entity": self._power_price_entity_id,
@@ -700,13 +1131,35 @@ class PowerPriceLevelSensor(SensorEntity):
                 "cheap_hours_night": int(cfg.get(CONF_CHEAP_HOURS_NIGHT, 0)),
                 "cheap_hours_day": int(cfg.get(CONF_CHEAP_HOURS_DAY, 0)),
                 "cheap_hours_evening": int(cfg.get(CONF_CHEAP_HOURS_EVENING, 0)),
+                "resolution": str(cfg.get(CONF_RESOLUTION, DEFAULT_RESOLUTION)),
+                "ranking": str(cfg.get(CONF_RANKING, DEFAULT_RANKING)),
             },
-            "prices": {
-                "today": [self._get_pricelevel(h, today, cfg) for h in range(24)],
-                "tomorrow": [self._get_pricelevel(h, tomorrow, cfg) for h in range(24)] if tomorrow else [],
-            },
-            "en_prices": {
-                "today": en_prices_today,
-                "tomorrow": en_prices_tomorrow,
-            },
+        }
+        compact = _is_compact(cfg)
+        self._attrs.update(self._level_table_attrs(not compact))
+        if compact:
+            self._attrs["start"] = {
+                "today": start_today.isoformat(),
+                "tomorrow": (start_today + timedelta(days=1)).isoformat(),
+            }
+            self._attrs["slot_minutes"] = slot_minutes
+        self._select_slot(_slot_index(now, slot_minutes))
+
+    def _level_table_attrs(self, labelled: bool) -> dict[str, Any]:
+        """`levels` and, with `labelled` (Standard format), the label tables projected from them."""
+        # Level keys (language independent) in both formats
+        attrs: dict[str, Any] = {"levels": {"today": self._state_table, "tomorrow": self._next_state_table or []}}
+        if labelled:
+            # English labels for `en_prices`; `async_update` has loaded the shared
+            # translation cache. With English selected both attributes share one table.
+            labels = self._labels or {}
+            attrs["prices"] = self._label_tables(labels)
+            attrs["en_prices"] = attrs["prices"] if labels == self._en_labels else self._label_tables(self._en_labels)
+        return attrs
+
+    def _label_tables(self, labels: dict[str, str]) -> dict[str, list[Optional[str]]]:
+        """Project today's and tomorrow's level keys through `labels`."""
+        return {
+            "today": [labels.get(k) for k in self._state_table],
+            "tomorrow": [labels.get(k) for k in self._next_state_table or []],
         }
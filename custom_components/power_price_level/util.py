@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Mapping
+from typing import Any
+
+
 def parse_unit(value: str | float | int) -> float:
     """Parse monetary input allowing decimal comma (e.g. '37,05'). Returns float.
 
@@ -19,3 +24,78 @@ def parse_unit(value: str | float | int) -> float:
 
 # Backwards-compatible alias for code that still calls the old name.
 parse_ore = parse_unit
+
+
+def parse_window_hours(value: str | int | list[Any] | None, maximum: int = 24) -> tuple[int, ...]:
+    """Parse window lengths in whole hours (e.g. '1, 3' or [1, 3]); sorted, unique.
+
+    An empty value gives no windows. Raises ValueError for anything that is
+    not a whole number of hours between 1 and `maximum`.
+    """
+    if value is None:
+        return ()
+    if isinstance(value, int):
+        parts: list[Any] = [value]
+    elif isinstance(value, (list, tuple)):
+        parts = list(value)
+    else:
+        parts = [p for p in str(value).replace(";", ",").split(",") if p.strip()]
+
+    hours = set()
+    for part in parts:
+        hour = int(str(part).strip())
+        if not 1 <= hour <= maximum:
+            raise ValueError(f"Window length out of range: {hour}")
+        hours.add(hour)
+    return tuple(sorted(hours))
+
+
+def parse_level_sets(value: str | list[Any] | None, keys: tuple[str, ...]) -> list[tuple[str, ...]]:
+    """Parse sets of level keys, sets separated by ';' and keys by ',' (e.g. 'cheap, cheap_time; expensive').
+
+    Keys keep the order of `keys`; empty and repeated sets are dropped.
+    Raises ValueError for a key that is not in `keys`.
+    """
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        groups = [part if isinstance(part, (list, tuple)) else str(part).split(",") for part in value]
+    else:
+        groups = [group.split(",") for group in str(value).split(";")]
+
+    sets: list[tuple[str, ...]] = []
+    for group in groups:
+        chosen = {str(key).strip().lower() for key in group if str(key).strip()}
+        unknown = chosen - set(keys)
+        if unknown:
+            raise ValueError(f"Unknown level keys: {', '.join(sorted(unknown))}")
+        levels = tuple(key for key in keys if key in chosen)
+        if levels and levels not in sets:
+            sets.append(levels)
+    return sets
+
+
+def format_level_sets(sets: list[tuple[str, ...]]) -> str:
+    """Inverse of `parse_level_sets` (the normalized form stored in the entry)."""
+    return "; ".join(", ".join(levels) for levels in sets)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(map(repr, value)))
+    return value
+
+
+def fingerprint(*parts: Any) -> int:
+    """Content fingerprint of plain data (lists, dicts, scalars, dates).
+
+    Used to skip recomputation when price arrays and config are unchanged.
+    Stable across processes (a digest of the values' repr), so it can be
+    stored with restored tables and compared after a restart.
+    """
+    digest = hashlib.blake2b(repr(_freeze(parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
@@ -0,0 +1,249 @@
+"""NumPy block backend for the engine: many day tables at once.
+
+The functions here compute the same tables as `engine.py`, bit for bit,
+but for a 2D block (days x slots, areas x slots, ...) in one pass. NumPy
+is optional: `price_tables`, `level_tables` and `hourly_tables` take and
+return plain lists and fall back to the pure-Python engine when NumPy is
+not installed (`HAS_NUMPY`).
+
+Rows of different length (23/24/25 hours, 92/96/100 quarter-hours) or
+with different `slot_hours` are grouped and computed block by block.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from .engine import (
+    LEVEL_KEYS,
+    LevelConfig,
+    PriceConfig,
+    day_levels,
+    price_table,
+    quarterhour_to_hourly,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised without numpy
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+# ---------------------------
+# Array kernels (NumPy required)
+# ---------------------------
+
+def _round4(a: "np.ndarray") -> "np.ndarray":
+    """`round(x, 4)` elementwise, matching Python's correctly rounded result.
+
+    `rint(x * 1e4) / 1e4` agrees with Python except where `x * 1e4` lies
+    within float error of a half; those few entries are redone with `round`.
+    """
+    scaled = a * 1e4
+    out = np.rint(scaled) / 1e4
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ambiguous.any():
+        out[ambiguous] = [round(float(v), 4) for v in a[ambiguous]]
+    return out
+
+
+def _is_night(hours: "np.ndarray", start: int, end: int) -> "np.ndarray":
+    # support wrapping night window
+    if start < end:
+        return (hours >= start) & (hours < end)
+    return (hours >= start) | (hours < end)
+
+
+def hourly_block(quarters: "np.ndarray") -> "np.ndarray":
+    """`quarterhour_to_hourly` for a block of equal-length quarter-hour rows (NaN = missing)."""
+    rows, length = quarters.shape
+    hour_count = (length + 3) // 4
+    padded = np.full((rows, hour_count * 4), np.nan)
+    padded[:, :length] = quarters
+    q = padded.reshape(rows, hour_count, 4)
+    present = ~np.isnan(q)
+    vals = np.where(present, q, 0.0)
+    # Sequential sum, as Python's `sum` over the present values
+    total = ((vals[..., 0] + vals[..., 1]) + vals[..., 2]) + vals[..., 3]
+    n = present.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, total / np.maximum(n, 1), np.nan)
+
+
+def slot_price_block(spot: "np.ndarray", hours: "np.ndarray", pcfg: PriceConfig, fill_gaps: bool = True) -> "np.ndarray":
+    """`build_slot_prices` for a block; `hours` is (slots,) or (rows, slots)."""
+    if fill_gaps:
+        prev = np.concatenate([np.full((spot.shape[0], 1), np.nan), spot[:, :-1]], axis=1)
+        spot = np.where(np.isnan(spot), prev, spot)
+    add = np.where(_is_night(hours, pcfg.grid_night_start, pcfg.grid_night_end), pcfg.grid_night, pcfg.grid_day)
+    return _round4((spot + add) + pcfg.additional)
+
+
+def _group_bounds(sorted_keys: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """First and one-past-last sorted position of each position's equal-key group."""
+    rows, n = sorted_keys.shape
+    pos = np.broadcast_to(np.arange(n), (rows, n))
+    starts = np.ones((rows, n), dtype=bool)
+    starts[:, 1:] = sorted_keys[:, 1:] != sorted_keys[:, :-1]
+    ends = np.ones((rows, n), dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, pos, n)[:, ::-1], axis=1)[:, ::-1] + 1
+    return first, last
+
+
+def _ranks(keys: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """Per slot: (lo, hi) sorted-position bounds of its rank group (stable, NaN last)."""
+    order = np.argsort(keys, axis=1, kind="stable")
+    first, last = _group_bounds(np.take_along_axis(keys, order, axis=1))
+    lo = np.empty_like(first)
+    hi = np.empty_like(last)
+    np.put_along_axis(lo, order, first, axis=1)
+    np.put_along_axis(hi, order, last, axis=1)
+    return lo, hi
+
+
+def _period_hits(keys: "np.ndarray", members: "np.ndarray", count: int) -> "np.ndarray":
+    """Slots of `members` among the `count` cheapest of the period (ties included)."""
+    if count <= 0:
+        return np.zeros(keys.shape, dtype=bool)
+    members = members & ~np.isnan(keys)
+    lo, _ = _ranks(np.where(members, keys, np.inf))
+    return members & (lo < count)
+
+
+def level_codes(prices: "np.ndarray", lcfg: LevelConfig, hours: Optional["np.ndarray"] = None, slots_per_hour: int = 1) -> "np.ndarray":
+    """`day_levels` for a block of rows as codes into `LEVEL_KEYS` (NaN = missing).
+
+    `hours` is the local hour of each slot, (slots,) or (rows, slots); without
+    it slot i is hour i.
+    """
+    rows, n = prices.shape
+    if hours is None:
+        hours = np.arange(n)
+    hours = np.broadcast_to(hours, (rows, n))
+
+    vals = prices.astype(float)
+    keys = _round4(vals)
+    present = ~np.isnan(keys)
+    count = present.sum(axis=1)[:, None]
+    missing = n - count
+    lo, hi = _ranks(keys)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Sequential sum, as Python's `sum` over the present values
+        average = np.cumsum(np.where(present, vals, 0.0), axis=1)[:, -1:] / count
+
+    sph = slots_per_hour
+    cheapest_end = min(1 + max(0, lcfg.cheap_hours) * sph, n)
+    expensive_end = min(1 + max(0, lcfg.expensive_hours) * sph, n)
+
+    night_end = lcfg.night_hour_end
+    day_end = lcfg.day_hour_end
+    night = hours < night_end if night_end > 0 else np.ones((rows, n), dtype=bool)
+    daytime = (hours >= night_end) & (hours < day_end)
+    evening = hours >= day_end
+    cheap_time = (
+        _period_hits(keys, night, lcfg.cheap_hours_night * sph)
+        | _period_hits(keys, daytime, lcfg.cheap_hours_day * sph)
+        | _period_hits(keys, evening, lcfg.cheap_hours_evening * sph)
+    )
+
+    cheapprice = lcfg.cheap_price_ore
+    conditions = [
+        ~present,
+        (vals <= cheapprice) if cheapprice > 0 else np.zeros((rows, n), dtype=bool),
+        lo == 0,
+        (lo < cheapest_end) & (hi > 1),
+        cheap_time,
+        (missing == 0) & (hi == count),
+        (n - hi < expensive_end) & (n - lo > 1),
+        vals <= average,
+    ]
+    choices = [
+        LEVEL_KEYS.index(k)
+        for k in ("unavailable", "cheap", "cheapest_hour", "cheapest_hours", "cheap_time", "most_expensive_hour", "most_expensive_hours", "normal")
+    ]
+    return np.select(conditions, choices, default=LEVEL_KEYS.index("expensive")).astype(np.int8)
+
+
+# ---------------------------
+# List API (pure-Python fallback)
+# ---------------------------
+
+def _to_array(rows: Sequence[Sequence[Any]]) -> "np.ndarray":
+    # None -> NaN
+    return np.array(rows, dtype=float)
+
+
+def _to_lists(block: "np.ndarray") -> list[list[Optional[float]]]:
+    return [[None if v != v else v for v in row] for row in block.tolist()]
+
+
+def _groups(keys: Sequence[Any]) -> dict[Any, list[int]]:
+    out: dict[Any, list[int]] = {}
+    for i, key in enumerate(keys):
+        out.setdefault(key, []).append(i)
+    return out
+
+
+def hourly_tables(rows: Sequence[Sequence[Optional[float]]]) -> list[list[Optional[float]]]:
+    """`quarterhour_to_hourly` for many rows."""
+    if not HAS_NUMPY:
+        return [quarterhour_to_hourly(list(row)) for row in rows]
+    out: list[Any] = [None] * len(rows)
+    for length, idx in _groups([len(row) for row in rows]).items():
+        if length <= 25:
+            # Already hourly (or empty)
+            for i in idx:
+                out[i] = quarterhour_to_hourly(list(rows[i]))
+            continue
+        for i, row in zip(idx, _to_lists(hourly_block(_to_array([rows[i] for i in idx])))):
+            out[i] = row
+    return out
+
+
+def price_tables(rows: Sequence[Sequence[Optional[float]]], pcfg: PriceConfig, slot_hours: Optional[Sequence[Sequence[int]]] = None) -> list[list[Optional[float]]]:
+    """`price_table` for many days; `slot_hours` gives each row's slot hours (None: slot i is hour i)."""
+    if slot_hours is None:
+        slot_hours = [range(len(row)) for row in rows]
+    if not HAS_NUMPY:
+        return [price_table(list(row), pcfg, list(hours)) for row, hours in zip(rows, slot_hours)]
+
+    out: list[Any] = [None] * len(rows)
+    for hours, idx in _groups([tuple(h) for h in slot_hours]).items():
+        if not hours:
+            for i in idx:
+                out[i] = []
+            continue
+        block = slot_price_block(_to_array([rows[i] for i in idx]), np.array(hours), pcfg)
+        for i, row in zip(idx, _to_lists(block)):
+            out[i] = row
+    return out
+
+
+def level_tables(rows: Sequence[Sequence[Optional[float]]], lcfg: LevelConfig, slot_hours: Optional[Sequence[Sequence[int]]] = None, slots_per_hour: int = 1) -> list[list[str]]:
+    """`day_levels` for many days; `slot_hours` gives each row's slot hours (None: slot i is hour i)."""
+    if slot_hours is None:
+        slot_hours = [range(len(row)) for row in rows]
+    if not HAS_NUMPY:
+        return [day_levels(list(row), lcfg, list(hours), slots_per_hour) for row, hours in zip(rows, slot_hours)]
+
+    out: list[Any] = [None] * len(rows)
+    keys = np.array(LEVEL_KEYS)
+    for hours, idx in _groups([tuple(h) for h in slot_hours]).items():
+        n = len(hours)
+        # Too short (or empty) days are unavailable throughout, as in `day_levels`
+        full = [i for i in idx if len(rows[i]) >= n]
+        for i in idx:
+            if len(rows[i]) < n or n == 0:
+                out[i] = ["unavailable"] * n
+        if not full or n == 0:
+            continue
+        block = _to_array([list(rows[i])[:n] for i in full])
+        codes = level_codes(block, lcfg, np.array(hours), slots_per_hour)
+        for i, row in zip(full, keys[codes].tolist()):
+            out[i] = row
+    return out
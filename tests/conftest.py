@@ -0,0 +1,102 @@
+"""Shared fixtures for the Power Price Level tests (pytest-homeassistant-custom-component)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.power_price_level.const import DOMAIN
+
+pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+NORDPOOL = "sensor.nordpool_kwh_oslo_nok_3_10_025"
+TIME_ZONE = "Europe/Oslo"
+
+ENTRY_DATA: dict[str, Any] = {
+    "nordpool_entity": NORDPOOL,
+    "sensor_name": "Power Price",
+    "currency": "NOK",
+    "grid_day": 0.4,
+    "grid_night": 0.3,
+    "grid_night_start": 22,
+    "grid_night_end": 6,
+    "additional": 0.01,
+    "cheap_price": 0.0,
+    "night_hour_start": 22,
+    "night_hour_end": 6,
+    "day_hour_end": 15,
+    "cheap_hours": 5,
+    "expensive_hours": 5,
+    "cheap_hours_night": 2,
+    "cheap_hours_day": 2,
+    "cheap_hours_evening": 2,
+    "level_language": "en",
+    "update_debounce": 0,
+}
+
+# Plain threshold levels: cheap below 0.5, no ranked hours
+THRESHOLD_ONLY: dict[str, Any] = {
+    "cheap_price": 0.5,
+    "grid_day": 0,
+    "grid_night": 0,
+    "additional": 0,
+    "cheap_hours": 0,
+    "expensive_hours": 0,
+    "cheap_hours_night": 0,
+    "cheap_hours_day": 0,
+    "cheap_hours_evening": 0,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def spot(day: int, count: int = 24) -> list[float]:
+    """Deterministic synthetic Nordpool prices for one day."""
+    return [round(0.5 + ((i * 7 + day) % 23) / 20, 4) for i in range(count)]
+
+
+def cheap_at(*hours: int) -> list[float]:
+    """Hourly spot prices that are cheap (with `THRESHOLD_ONLY`) at `hours` only."""
+    today = [1.0] * 24
+    for hour in hours:
+        today[hour] = 0.01
+    return today
+
+
+def local(*args: int) -> datetime:
+    """Aware datetime in the test time zone."""
+    return datetime(*args, tzinfo=dt_util.get_time_zone(TIME_ZONE))
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    today: list[Any],
+    tomorrow: list[Any] | None = None,
+    **options: Any,
+) -> MockConfigEntry:
+    """Set the Nordpool state and set up one entry with `options` over the defaults."""
+    hass.states.async_set(NORDPOOL, 1.0, {"today": today, "tomorrow": tomorrow or []})
+    entry = MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, **options}, entry_id="e1", version=2)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def async_run_hours(hass: HomeAssistant, freezer, start: datetime, hours: range, each=None) -> None:
+    """Move the clock just past each hour after `start` and fire the timers; `each(hour)` checks in between."""
+    for hour in hours:
+        point = start + timedelta(hours=hour, seconds=1)
+        freezer.move_to(point)
+        async_fire_time_changed(hass, point)
+        await hass.async_block_till_done()
+        if each:
+            each(hour)
@@ -0,0 +1,37 @@
+"""The offline benchmark cycle computes what the sensors publish."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import NORDPOOL, TIME_ZONE, async_setup_entry, local
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import bench_pipeline  # noqa: E402
+from fixtures import nordpool_attributes  # noqa: E402
+
+
+@pytest.mark.parametrize("resolution", ["hour", "quarter_hour"])
+async def test_offline_cycle_matches_sensors(hass: HomeAssistant, freezer, resolution) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    now = local(2024, 10, 1, 12)
+    freezer.move_to(now)
+    nordpool = nordpool_attributes("normal_96")
+    options = {**bench_pipeline.ENTRY_DATA, "nordpool_entity": NORDPOOL, "resolution": resolution, "update_debounce": 0}
+    await async_setup_entry(hass, nordpool["today"], nordpool["tomorrow"], **options)
+
+    cycle = bench_pipeline._offline_cycle(nordpool, options, dt_util.get_time_zone(TIME_ZONE), now)
+
+    price = hass.states.get("sensor.power_price").attributes
+    level = hass.states.get("sensor.power_price_level").attributes
+    today, tomorrow = cycle["days"]
+    assert price["prices"] == {"today": today["prices"], "tomorrow": tomorrow["prices"]}
+    assert price["raw_today"] == today["raw"] and price["raw_tomorrow"] == tomorrow["raw"]
+    assert level["levels"] == {"today": today["levels"], "tomorrow": tomorrow["levels"]}
+    assert level["en_prices"] == {"today": today["labels"], "tomorrow": tomorrow["labels"]}
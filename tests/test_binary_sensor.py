@@ -0,0 +1,61 @@
+"""Level set binary sensors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.power_price_level.const import DOMAIN
+
+from .conftest import THRESHOLD_ONLY, TIME_ZONE, async_run_hours, async_setup_entry, cheap_at
+
+
+async def test_level_binary_sensors(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.now()))
+    freezer.move_to(start + timedelta(hours=1, minutes=5))
+    entry = await async_setup_entry(hass, cheap_at(2, 3, 10), custom_levels="cheap", **THRESHOLD_ONLY)
+
+    registry = er.async_get(hass)
+    entries = {item.unique_id: item for item in registry.entities.values() if item.domain == "binary_sensor"}
+    # Predefined sets are created disabled, custom sets enabled
+    assert entries["e1_power_price_level_cheap"].disabled_by is not None
+    entity_id = entries["e1_power_price_level_custom_cheap"].entity_id
+    state = hass.states.get(entity_id)
+    assert state.state == "off"
+    assert dt_util.parse_datetime(state.attributes["next_change"]) == start + timedelta(hours=2)
+
+    writes = []
+    hass.bus.async_listen(
+        "state_changed",
+        lambda event: writes.append(event.data["new_state"].state)
+        if event.data["entity_id"] == entity_id and event.data["new_state"]
+        else None,
+    )
+
+    def _check(hour: int) -> None:
+        if hour == 2:
+            state = hass.states.get(entity_id)
+            assert state.state == "on"
+            assert dt_util.parse_datetime(state.attributes["next_change"]) == start + timedelta(hours=4)
+
+    await async_run_hours(hass, freezer, start, range(2, 12), _check)
+    # Written only when the state flips
+    assert writes == ["on", "off", "on", "off"]
+
+    # Changing the custom sets adds and removes only the sets that changed
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.data, "custom_levels": "cheap, most_expensive_hour; expensive"}
+    )
+    await hass.async_block_till_done()
+    unique_ids = {item.unique_id for item in registry.entities.values() if item.domain == "binary_sensor"}
+    assert "e1_power_price_level_custom_cheap" not in unique_ids
+    assert "e1_power_price_level_custom_expensive" in unique_ids
+    state = hass.states.get(
+        registry.async_get_entity_id("binary_sensor", DOMAIN, "e1_power_price_level_custom_cheap_most_expensive_hour")
+    )
+    assert state.state == "on"
+    assert state.name.endswith("cheap + most_expensive_hour")
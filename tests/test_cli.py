@@ -0,0 +1,76 @@
+"""Offline batch CLI: DST-day CSV rows and per-record error handling."""
+
+from __future__ import annotations
+
+import csv
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.power_price_level import cli
+
+from .conftest import ENTRY_DATA, TIME_ZONE, spot
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_text(json.dumps(ENTRY_DATA))
+    return str(path)
+
+
+@pytest.mark.parametrize(("day", "hours"), [("2025-03-30", 23), ("2025-10-26", 25), ("2025-10-27", 24)])
+def test_csv_rows_on_dst_days(tmp_path, config_file, day, hours) -> None:
+    records = tmp_path / "days.jsonl"
+    records.write_text(json.dumps({"date": day, "today": spot(0, hours)}) + "\n")
+    out = tmp_path / "out.csv"
+
+    assert cli.main(["-c", config_file, "-z", TIME_ZONE, "-f", "csv", "-o", str(out), str(records)]) == 0
+
+    rows = list(csv.DictReader(out.open(encoding="utf-8")))
+    assert len(rows) == hours
+    starts = [datetime.fromisoformat(row["start"]) for row in rows]
+    ends = [datetime.fromisoformat(row["end"]) for row in rows]
+    assert all(end - start == timedelta(hours=1) for start, end in zip(starts, ends))
+    assert ends[:-1] == starts[1:]
+    # Local offsets follow the zone (the fall-back day has two 02:00 rows)
+    offsets = {start.utcoffset() for start in starts}
+    assert len(offsets) == (1 if hours == 24 else 2)
+
+
+def test_bad_records_do_not_stop_the_batch(tmp_path, config_file, capsys) -> None:
+    records = tmp_path / "days.jsonl"
+    records.write_text(
+        "\n".join(
+            [
+                json.dumps({"date": "2025-10-01", "today": spot(0)}),
+                "{not json",
+                json.dumps(["a", "list"]),
+                json.dumps("a string"),
+                json.dumps({"today": spot(1)}),
+                json.dumps({"date": "2025-10-02", "today": spot(2)}),
+            ]
+        )
+        + "\n"
+    )
+    out = tmp_path / "out.jsonl"
+
+    assert cli.main(["-c", config_file, "-z", TIME_ZONE, "-o", str(out), str(records)]) == 1
+
+    results = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["date"] for r in results] == ["2025-10-01", "2025-10-02"]
+    errors = capsys.readouterr().err.splitlines()
+    assert [line.split(": ")[0] for line in errors] == [f"{records}:{n}" for n in (2, 3, 4, 5)]
+
+
+def test_malformed_json_document(tmp_path, config_file, capsys) -> None:
+    bad = tmp_path / "bad.json"
+    bad.write_text("[{")
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps([{"date": "2025-10-01", "today": spot(0)}]))
+    out = tmp_path / "out.jsonl"
+
+    assert cli.main(["-c", config_file, "-z", TIME_ZONE, "-o", str(out), str(bad), str(good)]) == 1
+    assert len(out.read_text().splitlines()) == 1
+    assert capsys.readouterr().err.startswith(f"{bad}: ")
@@ -0,0 +1,67 @@
+"""Discovery: ranked candidates in the flows and the registry index lifetime."""
+
+from __future__ import annotations
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.power_price_level.const import CONF_NORDPOOL_ENTITY, CONF_POWERPRICE_ENTITY, DOMAIN
+from custom_components.power_price_level.discovery import DATA_DISCOVERY
+
+from .conftest import async_setup_entry, spot
+
+
+def _options(result, key: str) -> list[str]:
+    for marker, value in result["data_schema"].schema.items():
+        if marker == key:
+            return [option["value"] for option in value.config["options"]]
+    raise AssertionError(f"{key} not in form")
+
+
+def _register_nordpool(hass: HomeAssistant, object_id: str, with_prices: bool) -> str:
+    entry = er.async_get(hass).async_get_or_create("sensor", "nordpool", object_id, suggested_object_id=object_id)
+    if with_prices:
+        hass.states.async_set(entry.entity_id, 1.0, {"today": spot(0), "friendly_name": object_id})
+    return entry.entity_id
+
+
+async def test_config_flow_offers_ranked_candidates(hass: HomeAssistant) -> None:
+    loading = _register_nordpool(hass, "a_loading", with_prices=False)
+    priced = _register_nordpool(hass, "b_priced", with_prices=True)
+
+    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
+    # Sensors with prices first, then the ones still loading
+    assert _options(result, CONF_NORDPOOL_ENTITY) == [priced, loading]
+    default = next(marker for marker in result["data_schema"].schema if marker == CONF_NORDPOOL_ENTITY).default()
+    assert default == priced
+
+
+async def test_options_flow_offers_own_price_sensor_first(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0))
+    other = er.async_get(hass).async_get_or_create("sensor", DOMAIN, "other_power_price", suggested_object_id="other_price")
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert _options(result, CONF_POWERPRICE_ENTITY)[:2] == ["sensor.power_price", other.entity_id]
+
+
+async def test_unload_drops_registry_listener(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0))
+    counts = []
+    for _ in range(3):
+        # Opening a flow builds the registry index (and its bus listener)
+        await hass.config_entries.options.async_init(entry.entry_id)
+        assert DATA_DISCOVERY in hass.data[DOMAIN]
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert DATA_DISCOVERY not in hass.data[DOMAIN]
+        counts.append(hass.bus.async_listeners().get(er.EVENT_ENTITY_REGISTRY_UPDATED, 0))
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    # Reloads do not pile up listeners
+    assert counts[0] == counts[1] == counts[2]
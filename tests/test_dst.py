@@ -0,0 +1,49 @@
+"""Slot layout on DST days: 23/25 real hours, non-overlapping raw slots."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import TIME_ZONE, async_setup_entry, local, spot
+
+# (name, local noon of the day, hours of the day)
+DST_DAYS = [
+    ("spring_forward", (2025, 3, 30, 12), 23),
+    ("fall_back", (2025, 10, 26, 12), 25),
+]
+
+
+@pytest.mark.parametrize(("resolution", "per_hour"), [("hour", 1), ("quarter_hour", 4)])
+@pytest.mark.parametrize(("name", "noon", "hours"), DST_DAYS, ids=[d[0] for d in DST_DAYS])
+async def test_raw_slots_follow_real_time(hass: HomeAssistant, freezer, resolution, per_hour, name, noon, hours) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    freezer.move_to(local(*noon))
+    await async_setup_entry(hass, spot(0, hours * 4), spot(1, 96), resolution=resolution)
+
+    state = hass.states.get("sensor.power_price")
+    raw = state.attributes["raw_today"]
+    assert len(raw) == hours * per_hour
+    assert len(state.attributes["prices"]["today"]) == hours * per_hour
+
+    step = 60 // per_hour * 60
+    starts = [dt_util.parse_datetime(slot["start"]) for slot in raw]
+    ends = [dt_util.parse_datetime(slot["end"]) for slot in raw]
+    for start, end in zip(starts, ends):
+        # One slot of real time, and a valid local time (round trips through UTC)
+        assert (end - start).total_seconds() == step
+        assert dt_util.as_local(dt_util.as_utc(end)).isoformat() == end.isoformat()
+    # Contiguous, no overlap, ending at the next local midnight
+    assert ends[:-1] == starts[1:]
+    assert starts[0] == dt_util.start_of_local_day(local(*noon))
+    assert ends[-1] == dt_util.start_of_local_day(local(*noon) + timedelta(days=1))
+
+    # The current slot is the one containing "now"
+    index = next(i for i, (start, end) in enumerate(zip(starts, ends)) if start <= dt_util.now() < end)
+    assert state.state == str(state.attributes["prices"]["today"][index])
+
+    level = hass.states.get("sensor.power_price_level")
+    assert len(level.attributes["levels"]["today"]) == hours * per_hour
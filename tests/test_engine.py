@@ -0,0 +1,45 @@
+"""HA-free engine checks: contiguous windows against a brute-force reference."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.power_price_level.engine import window_table
+
+
+def _brute_force(prices, length):
+    sums = []
+    for s in range(len(prices) - length + 1):
+        part = prices[s : s + length]
+        sums.append(None if None in part else round(sum(part), 4))
+    cheapest, most_expensive = [], []
+    for i in range(len(prices)):
+        ahead = [(v, s) for s, v in enumerate(sums) if s >= i and v is not None]
+        cheapest.append(min(ahead)[1] if ahead else None)
+        most_expensive.append(min((-v, s) for v, s in ahead)[1] if ahead else None)
+    return sums, cheapest, most_expensive
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("length", [1, 3, 4, 12])
+def test_window_table_matches_brute_force(seed, length) -> None:
+    rng = random.Random(seed)
+    prices = [None if rng.random() < 0.05 else round(rng.uniform(-0.2, 3.0), 4) for _ in range(rng.choice([23, 48, 96]))]
+
+    table = window_table(prices, length)
+
+    assert (table.sums, table.cheapest, table.most_expensive) == _brute_force(prices, length)
+
+
+def test_equal_windows_pick_the_earliest() -> None:
+    # Every 3-slot window sums to 0.6; sliding add/subtract drifts in the last bits
+    prices = [0.1, 0.2, 0.3] * 16
+
+    table = window_table(prices, 3)
+
+    assert len(set(table.sums)) == 1
+    assert table.cheapest[0] == 0 and table.most_expensive[0] == 0
+    assert table.cheapest[5] == 5 and table.most_expensive[5] == 5
+    assert table.average(0) == 0.2
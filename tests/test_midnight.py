@@ -0,0 +1,109 @@
+"""Tomorrow's tables are promoted at local midnight without a recompute."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.power_price_level import sensor
+
+from .conftest import NORDPOOL, TIME_ZONE, async_setup_entry, local, spot
+
+
+@pytest.mark.parametrize(("resolution", "count"), [("hour", 24), ("quarter_hour", 96)])
+async def test_tomorrow_is_promoted_at_midnight(hass: HomeAssistant, freezer, resolution, count) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    freezer.move_to(local(2025, 3, 10, 23, 59, 30))
+    await async_setup_entry(hass, spot(0, count), spot(1, count), resolution=resolution)
+    tomorrow_prices = hass.states.get("sensor.power_price").attributes["prices"]["tomorrow"]
+    tomorrow_levels = hass.states.get("sensor.power_price_level").attributes["prices"]["tomorrow"]
+    assert len(tomorrow_prices) == len(tomorrow_levels) == count
+
+    calls = []
+    price_update, level_update = sensor.PowerPriceSensor.async_update, sensor.PowerPriceLevelSensor.async_update
+
+    async def _price_update(self):
+        calls.append("price")
+        await price_update(self)
+
+    async def _level_update(self):
+        calls.append("level")
+        await level_update(self)
+
+    with (
+        patch.object(sensor.PowerPriceSensor, "async_update", _price_update),
+        patch.object(sensor.PowerPriceLevelSensor, "async_update", _level_update),
+    ):
+        freezer.move_to(local(2025, 3, 11))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        price = hass.states.get("sensor.power_price")
+        level = hass.states.get("sensor.power_price_level")
+        assert calls == []
+        assert price.attributes["prices"] == {"today": tomorrow_prices, "tomorrow": []}
+        assert level.attributes["prices"] == {"today": tomorrow_levels, "tomorrow": []}
+        assert float(price.state) == pytest.approx(tomorrow_prices[0], abs=1e-3)
+        assert level.state == tomorrow_levels[0]
+
+        # Nordpool rolls over later: its new "today" matches the promoted tables
+        hass.states.async_set(NORDPOOL, 1.0, {"today": spot(1, count), "tomorrow": []})
+        await hass.async_block_till_done()
+        assert calls == []
+        assert hass.states.get("sensor.power_price").attributes["prices"] == price.attributes["prices"]
+        assert hass.states.get("sensor.power_price_level").attributes["prices"] == level.attributes["prices"]
+
+        # Tomorrow's prices arrive: the next change recomputes as usual
+        hass.states.async_set(NORDPOOL, 1.0, {"today": spot(1, count), "tomorrow": spot(2, count)})
+        await hass.async_block_till_done()
+        assert calls == ["price", "level"]
+        assert len(hass.states.get("sensor.power_price").attributes["prices"]["tomorrow"]) == count
+
+
+async def test_rollover_with_other_prices_recomputes(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    freezer.move_to(local(2025, 3, 10, 23, 59, 30))
+    await async_setup_entry(hass, spot(0), spot(1))
+    promoted = hass.states.get("sensor.power_price").attributes["prices"]["tomorrow"]
+    freezer.move_to(local(2025, 3, 11))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    # Nordpool's new "today" is not the day the promoted tables were built from
+    hass.states.async_set(NORDPOOL, 1.0, {"today": spot(5), "tomorrow": []})
+    await hass.async_block_till_done()
+    price = hass.states.get("sensor.power_price")
+    assert price.attributes["prices"]["today"] != promoted
+    assert [slot["value"] for slot in price.attributes["raw_today"]] == price.attributes["prices"]["today"]
+    assert float(price.state) == pytest.approx(price.attributes["prices"]["today"][0], abs=1e-3)
+
+
+async def test_midnight_without_tomorrow_recomputes(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    freezer.move_to(local(2025, 3, 10, 23, 59, 30))
+    await async_setup_entry(hass, spot(0))
+
+    calls = []
+    price_update = sensor.PowerPriceSensor.async_update
+
+    async def _price_update(self):
+        calls.append("price")
+        await price_update(self)
+
+    with patch.object(sensor.PowerPriceSensor, "async_update", _price_update):
+        # Nothing to promote: the new day runs the full update from the source
+        freezer.move_to(local(2025, 3, 11))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert calls == ["price"]
+
+    hass.states.async_set(NORDPOOL, 1.0, {"today": spot(1), "tomorrow": []})
+    await hass.async_block_till_done()
+    price = hass.states.get("sensor.power_price")
+    level = hass.states.get("sensor.power_price_level")
+    assert price.attributes["raw_today"][0]["start"] == local(2025, 3, 11).isoformat()
+    assert len(price.attributes["prices"]["today"]) == 24
+    assert len(level.attributes["prices"]["today"]) == 24
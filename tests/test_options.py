@@ -0,0 +1,78 @@
+"""Option changes are applied to the running entities without reloading them."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from .conftest import NORDPOOL, async_setup_entry, spot
+
+INIT = {
+    "sensor_name": "Power Price",
+    "nordpool_entity": NORDPOOL,
+    "powerprice_entity": "sensor.power_price",
+    "level_language": "English",
+    "currency": "NOK",
+    "resolution": "hour",
+    "attribute_format": "standard",
+    "update_debounce": 0,
+}
+COSTS = {"grid_day": "0,4", "grid_night": "0,3", "additional": "0,01", "cheap_price": "0", "grid_night_start": 22, "grid_night_end": 6}
+MORE = {"night_hour_end": 6, "day_hour_end": 15, "cheap_hours": 5, "expensive_hours": 5, "cheap_hours_night": 2, "cheap_hours_day": 2, "cheap_hours_evening": 2}
+
+
+async def _configure(hass: HomeAssistant, entry, init: dict[str, Any] | None = None, costs: dict[str, Any] | None = None) -> None:
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {**INIT, **(init or {})})
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {**COSTS, **(costs or {})})
+    result = await hass.config_entries.options.async_configure(result["flow_id"], MORE)
+    assert result["type"] == "create_entry"
+    await hass.async_block_till_done()
+
+
+def _track_removals(hass: HomeAssistant) -> list[str]:
+    removed: list[str] = []
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        lambda event: removed.append(event.data["entity_id"]) if event.data["new_state"] is None else None,
+    )
+    return removed
+
+
+async def test_rename_keeps_entities(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1))
+    removed = _track_removals(hass)
+
+    await _configure(hass, entry, init={"sensor_name": "House"})
+
+    assert entry.title == "House"
+    assert removed == []
+    # Same entity ids, new names
+    assert hass.states.get("sensor.power_price").name == "House"
+    assert hass.states.get("sensor.power_price_level").name == "House Level"
+
+
+async def test_price_option_recomputes_in_place(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1))
+    removed = _track_removals(hass)
+    before = hass.states.get("sensor.power_price").attributes["prices"]["today"]
+
+    await _configure(hass, entry, costs={"additional": "1,01"})
+
+    after = hass.states.get("sensor.power_price").attributes["prices"]["today"]
+    assert [round(a - b, 4) for a, b in zip(after, before)] == [1.0] * len(before)
+    assert removed == []
+
+
+async def test_language_change_relabels(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1))
+    levels = hass.states.get("sensor.power_price_level").attributes["levels"]
+
+    await _configure(hass, entry, init={"level_language": "Norsk"})
+
+    state = hass.states.get("sensor.power_price_level")
+    # Same keys, labels now Norwegian
+    assert state.attributes["levels"] == levels
+    assert state.attributes["prices"] != state.attributes["en_prices"]
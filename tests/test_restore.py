@@ -0,0 +1,68 @@
+"""Restoring stored day tables across restarts."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import restore_state
+from pytest_homeassistant_custom_component.common import mock_restore_cache_with_extra_data
+
+from .conftest import NORDPOOL, async_setup_entry, spot
+
+
+async def _restart(hass: HomeAssistant, entry, nordpool: bool, **options: Any) -> None:
+    """Unload the entry, keep what it stored, change `options` and set it up again."""
+    stored = [
+        (item.state, item.extra_data.as_dict() if item.extra_data else {})
+        for item in restore_state.async_get(hass).async_get_stored_states()
+        if item.state.entity_id.startswith("sensor.")
+    ]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    mock_restore_cache_with_extra_data(hass, stored)
+    if not nordpool:
+        hass.states.async_remove(NORDPOOL)
+    hass.config_entries.async_update_entry(entry, options={**entry.data, **options})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_restored_tables_are_served(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1), resolution="quarter_hour")
+    price = hass.states.get("sensor.power_price")
+    level = hass.states.get("sensor.power_price_level")
+
+    # Nordpool not loaded yet after the restart
+    await _restart(hass, entry, nordpool=False)
+
+    assert hass.states.get("sensor.power_price").attributes["prices"] == price.attributes["prices"]
+    assert hass.states.get("sensor.power_price_level").state == level.state
+    assert hass.states.get("sensor.power_price_level").attributes["levels"] == level.attributes["levels"]
+
+
+async def test_cosmetic_options_keep_the_restored_tables(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1))
+    price = hass.states.get("sensor.power_price")
+    level = hass.states.get("sensor.power_price_level")
+
+    await _restart(hass, entry, nordpool=False, sensor_name="House", level_language="nb", window_hours="1")
+
+    restored_price = hass.states.get("sensor.power_price")
+    restored_level = hass.states.get("sensor.power_price_level")
+    assert restored_price.attributes["prices"] == price.attributes["prices"]
+    assert restored_price.name == "House"
+    assert restored_level.attributes["levels"] == level.attributes["levels"]
+    # Labels follow the new language without a recompute
+    assert restored_level.attributes["en_prices"] == level.attributes["en_prices"]
+    assert restored_level.attributes["prices"] != level.attributes["prices"]
+    assert restored_level.state == restored_level.attributes["prices"]["today"][level.attributes["prices"]["today"].index(level.state)]
+
+
+async def test_table_options_discard_the_restored_tables(hass: HomeAssistant) -> None:
+    entry = await async_setup_entry(hass, spot(0), spot(1))
+
+    await _restart(hass, entry, nordpool=False, additional=1.0)
+
+    # Built with other adders: not served, waits for Nordpool instead
+    assert "prices" not in hass.states.get("sensor.power_price").attributes
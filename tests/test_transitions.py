@@ -0,0 +1,77 @@
+"""Level timeline attributes and transition events."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.power_price_level.const import EVENT_LEVEL_TRANSITION
+
+from .conftest import THRESHOLD_ONLY, TIME_ZONE, async_run_hours, async_setup_entry, cheap_at
+
+
+async def test_transition_events(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.now()))
+    freezer.move_to(start + timedelta(hours=1, minutes=5))
+    events = []
+    hass.bus.async_listen(
+        EVENT_LEVEL_TRANSITION,
+        lambda event: events.append((event.data, hass.states.get("sensor.power_price_level").state)),
+    )
+    await async_setup_entry(hass, cheap_at(2, 3, 10), **THRESHOLD_ONLY)
+
+    level = hass.states.get("sensor.power_price_level")
+    assert level.attributes["next_level"] == "cheap"
+    assert dt_util.parse_datetime(level.attributes["next_change"]) == start + timedelta(hours=2)
+    assert dt_util.parse_datetime(level.attributes["next_start"]["cheap"]) == start + timedelta(hours=2)
+    assert events == []
+
+    await async_run_hours(hass, freezer, start, range(2, 12))
+
+    assert [(data["previous_level"], data["level"]) for data, _ in events] == [
+        ("most_expensive_hour", "cheap"),
+        ("cheap", "most_expensive_hour"),
+        ("most_expensive_hour", "cheap"),
+        ("cheap", "most_expensive_hour"),
+    ]
+    first, state_at_first = events[0]
+    assert first["entity_id"] == "sensor.power_price_level"
+    assert first["entry_id"] == "e1"
+    assert dt_util.parse_datetime(first["next_change"]) == start + timedelta(hours=4)
+    # Fired after the state write: listeners read the new label
+    assert state_at_first == "Cheap"
+    assert hass.states.get("sensor.power_price_level").attributes["next_level"] is None
+
+
+async def test_remaining_minutes(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.now()))
+    freezer.move_to(start + timedelta(minutes=5))
+    await async_setup_entry(hass, cheap_at(2, 3, 10), **THRESHOLD_ONLY)
+
+    # Counted from the start of the current slot to `next_change`
+    assert hass.states.get("sensor.power_price_level").attributes["remaining"] == 120
+    seen = {}
+
+    def _remaining(hour: int) -> None:
+        state = hass.states.get("sensor.power_price_level")
+        seen[hour] = state.attributes["remaining"]
+        if state.attributes["next_change"]:
+            next_change = dt_util.parse_datetime(state.attributes["next_change"])
+            assert next_change - (start + timedelta(hours=hour)) == timedelta(minutes=seen[hour])
+
+    await async_run_hours(hass, freezer, start, range(1, 12), _remaining)
+    assert seen == {1: 60, 2: 120, 3: 60, 4: 360, 5: 300, 6: 240, 7: 180, 8: 120, 9: 60, 10: 60, 11: 780}
+
+
+async def test_remaining_on_quarter_hours(hass: HomeAssistant, freezer) -> None:
+    hass.config.set_time_zone(TIME_ZONE)
+    start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.now()))
+    freezer.move_to(start + timedelta(hours=2, minutes=20))
+    await async_setup_entry(hass, cheap_at(2, 3, 10), resolution="quarter_hour", **THRESHOLD_ONLY)
+
+    # 02:15-04:00 cheap: 105 minutes from the start of the 02:15 slot
+    assert hass.states.get("sensor.power_price_level").attributes["remaining"] == 105